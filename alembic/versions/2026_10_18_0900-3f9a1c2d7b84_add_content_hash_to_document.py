@@ -0,0 +1,46 @@
+"""add content hash to document
+
+Revision ID: 3f9a1c2d7b84
+Revises: 48125cb10225
+Create Date: 2026-10-18 09:00:12.417305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a1c2d7b84"
+down_revision: Union[str, Sequence[str], None] = "48125cb10225"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "documents", sa.Column("content_hash", sa.String(length=64), nullable=True)
+    )
+    # Built concurrently so uploads and OCR updates keep writing to documents.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_documents_content_hash"),
+            "documents",
+            ["content_hash"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("ix_documents_content_hash"),
+            table_name="documents",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("documents", "content_hash")
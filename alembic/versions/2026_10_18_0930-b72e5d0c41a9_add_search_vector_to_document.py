@@ -0,0 +1,108 @@
+"""add search vector to document
+
+Revision ID: b72e5d0c41a9
+Revises: 3f9a1c2d7b84
+Create Date: 2026-10-18 09:30:47.803164
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b72e5d0c41a9"
+down_revision: Union[str, Sequence[str], None] = "3f9a1c2d7b84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# to_tsvector fails on results above 1 MB, so only the leading part of very
+# large OCR outputs is indexed.
+MAX_SEARCH_CHARS = 250_000
+SEARCH_VECTOR_EXPRESSION = (
+    "to_tsvector(documents_fts_config(), "
+    f"left(coalesce({{}}processed_text, ''), {MAX_SEARCH_CHARS}))"
+)
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A plain nullable column is added without rewriting the table; a stored
+    # generated column would rewrite and lock it for the whole migration.
+    op.add_column(
+        "documents",
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+    )
+    # The text search configuration is fixed here, and queries read it back
+    # from the database so they always match the stored vectors.
+    op.execute(
+        f"""
+        CREATE FUNCTION documents_fts_config() RETURNS regconfig AS $$
+            SELECT '{settings.FTS_CONFIG}'::regconfig
+        $$ LANGUAGE sql IMMUTABLE
+        """
+    )
+    op.execute(
+        f"""
+        CREATE FUNCTION documents_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR_EXPRESSION.format("NEW.")};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER documents_search_vector_update
+        BEFORE INSERT OR UPDATE OF processed_text ON documents
+        FOR EACH ROW EXECUTE FUNCTION documents_search_vector_update()
+        """
+    )
+
+    # Backfill existing rows in short transactions, then build the index
+    # without blocking writes.
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        backfill = sa.text(
+            f"""
+            UPDATE documents SET search_vector = {SEARCH_VECTOR_EXPRESSION.format("")}
+            WHERE id IN (
+                SELECT id FROM documents
+                WHERE search_vector IS NULL AND processed_text IS NOT NULL
+                LIMIT {BACKFILL_BATCH_SIZE}
+            )
+            """
+        )
+        while connection.execute(backfill).rowcount:
+            pass
+        op.create_index(
+            "ix_documents_search_vector",
+            "documents",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_documents_search_vector",
+            table_name="documents",
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+    op.execute("DROP TRIGGER IF EXISTS documents_search_vector_update ON documents")
+    op.execute("DROP FUNCTION IF EXISTS documents_search_vector_update()")
+    op.execute("DROP FUNCTION IF EXISTS documents_fts_config()")
+    op.drop_column("documents", "search_vector")
@@ -0,0 +1,41 @@
+"""add user documents index
+
+Revision ID: d19c8e6a2f57
+Revises: b72e5d0c41a9
+Create Date: 2026-10-18 10:00:05.128934
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d19c8e6a2f57"
+down_revision: Union[str, Sequence[str], None] = "b72e5d0c41a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so uploads and OCR updates keep writing to documents.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_documents_user_id_created_at_id",
+            "documents",
+            ["user_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_documents_user_id_created_at_id",
+            table_name="documents",
+            postgresql_concurrently=True,
+        )
@@ -1,7 +1,9 @@
-from elasticsearch import Elasticsearch
-from faststream.rabbit import RabbitBroker
+from elasticsearch import AsyncElasticsearch
+from faststream.rabbit import Channel, RabbitBroker
 from minio import Minio
 
+from app.api.queues import QueueMonitor
+from app.api.storage import AsyncStorage, create_http_client
 from app.core.config import settings
 
 minio_client = Minio(
@@ -9,8 +11,25 @@ minio_client = Minio(
     access_key=settings.MINIO_ACCESS,
     secret_key=settings.MINIO_SECRET,
     secure=settings.MINIO_SECURE,
+    region=settings.MINIO_REGION,
+    http_client=create_http_client(settings.MINIO_POOL_SIZE, settings.MINIO_TIMEOUT),
 )
 
-es_client = Elasticsearch(settings.ES_LINK)
+storage = AsyncStorage(minio_client, "documents", settings.MINIO_POOL_SIZE)
 
-broker = RabbitBroker(settings.RABBITMQ_URL)
+minio_public_client = Minio(
+    settings.MINIO_PUBLIC_ENDPOINT or settings.MINIO_ENDPOINT,
+    access_key=settings.MINIO_ACCESS,
+    secret_key=settings.MINIO_SECRET,
+    secure=settings.MINIO_SECURE,
+    region=settings.MINIO_REGION,
+)
+
+es_client = AsyncElasticsearch(settings.ES_LINK)
+
+broker = RabbitBroker(
+    settings.RABBITMQ_URL,
+    default_channel=Channel(publisher_confirms=True),
+)
+
+queue_monitor = QueueMonitor(broker, settings.OCR_QUEUE_DEPTH_TTL)
@@ -1,24 +1,57 @@
+import logging
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from faststream.rabbit import RabbitBroker
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.clients import broker
-from app.core.database import engine
+from app.api.clients import broker, queue_monitor
+from app.api.exceptions import NOT_AUTHENTICATED_EXCEPTION, OCR_BACKLOG_EXCEPTION
+from app.api.managers import OCR_QUEUES
+from app.api.utils import token_verifier
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.schemas import CurrentUserSchema
+
+logger = logging.getLogger(__name__)
 
 
 async def get_db() -> AsyncSession:
-    async with AsyncSession(engine) as session:
+    async with async_session_maker() as session:
         yield session
 
 
-async def get_broker():
-    broker_mq = broker
+async def get_broker() -> RabbitBroker:
+    return broker
+
+
+async def check_ocr_backlog():
     try:
-        await broker_mq.connect()
-        yield broker_mq
-    finally:
-        await broker_mq.close()
+        depth = await queue_monitor.get_total_depth(OCR_QUEUES.values())
+    except Exception:
+        logger.warning("Could not read OCR queue depth", exc_info=True)
+        return
+    if depth >= settings.OCR_BACKLOG_LIMIT:
+        raise OCR_BACKLOG_EXCEPTION
+
+
+def get_token(request: Request) -> str | None:
+    token = request.cookies.get("token")
+    if token:
+        return token
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and credentials:
+        return credentials
+    return None
+
+
+async def get_current_user(
+    token: str | None = Depends(get_token),
+) -> CurrentUserSchema:
+    if not token:
+        raise NOT_AUTHENTICATED_EXCEPTION
+    return await token_verifier.verify(token)
 
 
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
+CurrentUser = Annotated[CurrentUserSchema, Depends(get_current_user)]
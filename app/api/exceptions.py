@@ -1,6 +1,51 @@
 from fastapi import status, HTTPException
 
+from app.core.config import settings
+
 INCORRECT_DATA_EXCEPTION = HTTPException(
     status_code=status.HTTP_404_NOT_FOUND,
     detail="Неверный email или пароль",
 )
+
+NOT_AUTHENTICATED_EXCEPTION = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Необходима авторизация",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+FILE_TOO_LARGE_EXCEPTION = HTTPException(
+    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    detail="Файл превышает допустимый размер",
+)
+
+DOCUMENT_NOT_UPLOADED_EXCEPTION = HTTPException(
+    status_code=status.HTTP_409_CONFLICT,
+    detail="Файл документа не загружен",
+)
+
+TOO_MANY_FILES_EXCEPTION = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Слишком много файлов в одной загрузке",
+)
+
+INVALID_ARCHIVE_EXCEPTION = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Некорректный zip-архив",
+)
+
+INVALID_CURSOR_EXCEPTION = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Некорректный курсор",
+)
+
+OCR_BACKLOG_EXCEPTION = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Очередь распознавания переполнена, повторите попытку позже",
+    headers={"Retry-After": str(settings.OCR_BACKLOG_RETRY_AFTER)},
+)
+
+PASSWORD_HASHING_BUSY_EXCEPTION = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Сервис авторизации перегружен, повторите попытку позже",
+    headers={"Retry-After": "1"},
+)
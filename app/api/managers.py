@@ -1,71 +1,540 @@
-from typing import Optional
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from concurrent.futures import Executor
+from dataclasses import asdict
+from datetime import timedelta
+from typing import BinaryIO, Optional, Sequence
 from uuid import UUID, uuid4
-from PIL import Image
-import io
 
-from faststream.rabbit import RabbitBroker
-from fastapi import UploadFile
+from faststream.rabbit import RabbitBroker, RabbitQueue
+from fastapi import HTTPException, UploadFile
 
 from minio.error import S3Error
 
-import pytesseract
-from pdf2image import convert_from_bytes
-
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.clients import minio_client, broker
-from app.models import DocumentModel
-from app.schemas import OCRTaskSchema
+from app.api.clients import es_client, minio_public_client, storage
+from app.api.exceptions import (
+    DOCUMENT_NOT_UPLOADED_EXCEPTION,
+    FILE_TOO_LARGE_EXCEPTION,
+    INVALID_ARCHIVE_EXCEPTION,
+    TOO_MANY_FILES_EXCEPTION,
+)
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.crud import documents_crud
+from app.models import DocumentModel, DocumentStatus
+from app.schemas import (
+    BatchUploadResultSchema,
+    DocumentPagesSchema,
+    DocumentSearchHitSchema,
+    DocumentSearchResultSchema,
+    OCRTaskSchema,
+    PresignedUploadSchema,
+    TaskPriority,
+)
+from app.worker import ocr
+from app.worker.cache import OCRResult, OCRResultCache
+from app.worker.indexer import DocumentIndexer
+from app.worker.preprocessing import PreprocessOptions
+from app.worker.tiling import TilingOptions, stitch_tiles
+
+
+OCR_QUEUES = {
+    TaskPriority.INTERACTIVE: "ocr_tasks.interactive",
+    TaskPriority.BULK: "ocr_tasks",
+}
+DEAD_LETTER_QUEUE = "ocr_tasks.dead"
+
+
+async def choose_priority(
+    session: AsyncSession, user_id: UUID, size: int | None
+) -> TaskPriority:
+    if size is None or size > settings.OCR_INTERACTIVE_MAX_SIZE:
+        return TaskPriority.BULK
+    inflight = await documents_crud.count_user_documents(
+        session, user_id, (DocumentStatus.QUEUED, DocumentStatus.PROCESSING)
+    )
+    if inflight > settings.OCR_USER_INTERACTIVE_LIMIT:
+        return TaskPriority.BULK
+    return TaskPriority.INTERACTIVE
+
+
+def get_pages_prefix(user_id: UUID, doc_id: UUID) -> str:
+    return f"users/{user_id}/processed/{doc_id}/pages/"
+
+
+def get_render_dir() -> str | None:
+    if settings.OCR_RENDER_DIR:
+        return settings.OCR_RENDER_DIR
+    if os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return None
+
+
+def get_ocr_options() -> ocr.OCROptions:
+    return ocr.OCROptions(
+        pdf_dpi=settings.OCR_PDF_DPI,
+        render_dir=get_render_dir(),
+        min_text_chars=settings.OCR_TEXT_LAYER_MIN_CHARS,
+        preprocess=PreprocessOptions(
+            enabled=settings.OCR_PREPROCESS,
+            target_dpi=settings.OCR_TARGET_DPI,
+            max_width=settings.OCR_MAX_IMAGE_WIDTH,
+            max_pixels=settings.OCR_MAX_IMAGE_PIXELS,
+            binarize=settings.OCR_BINARIZE,
+            deskew=settings.OCR_DESKEW,
+        ),
+        tiling=TilingOptions(
+            min_height=settings.OCR_TILE_MIN_HEIGHT,
+            tile_height=settings.OCR_TILE_HEIGHT,
+            overlap=settings.OCR_TILE_OVERLAP,
+        ),
+    )
 
 
 class OCRManager:
+    def __init__(
+        self,
+        session: AsyncSession,
+        executor: Executor,
+        cache: OCRResultCache,
+        indexer: DocumentIndexer | None,
+    ):
+        self.session = session
+        self.executor = executor
+        self.cache = cache
+        self.indexer = indexer
+        self.options = get_ocr_options()
+        self._progress_lock = asyncio.Lock()
+
+    async def _run_in_executor(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def _set_status(self, doc: DocumentModel, status: DocumentStatus):
+        doc.status = status
+        await self.session.commit()
+
     @staticmethod
-    @broker.subscriber(queue="ocr_tasks")
-    async def process_ocr(task: OCRTaskSchema, session: AsyncSession):
-        doc_id = task.doc_id
+    async def _load_checkpoints(prefix: str) -> dict[int, ocr.PageText]:
+        names = await storage.list_objects(prefix)
+        checkpoints = await asyncio.gather(*(storage.get_bytes(name) for name in names))
+        pages = [ocr.PageText(**json.loads(data)) for data in checkpoints]
+        return {page.number: page for page in pages}
+
+    @staticmethod
+    async def _save_checkpoint(prefix: str, page: ocr.PageText):
+        await storage.put_bytes(
+            f"{prefix}{page.number:05d}.json", json.dumps(asdict(page)).encode()
+        )
+
+    async def _update_progress(self, doc_id: UUID, **values: int):
+        async with self._progress_lock:
+            await documents_crud.update_document_progress(
+                self.session, doc_id, **values
+            )
 
+    @staticmethod
+    async def _run_all(coroutines) -> list:
+        # Unlike gather, a TaskGroup cancels and awaits the remaining tasks
+        # when one fails, so none of them outlives the failed attempt.
         try:
-            file_data = minio_client.get_object("documents", task.file_path)
-            file_bytes = file_data.read()
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(coroutine) for coroutine in coroutines]
+        except ExceptionGroup as e:
+            raise e.exceptions[0]
+        return [task.result() for task in tasks]
 
-            if task.file_path.endswith(".pdf"):
-                images = convert_from_bytes(file_bytes)
-                text = "\n".join(pytesseract.image_to_string(img) for img in images)
-            else:
-                try:
-                    image = Image.open(io.BytesIO(file_bytes))
-                    text = pytesseract.image_to_string(image)
-                except Exception as img_e:
-                    raise ValueError(f"Failed to process image: {str(img_e)}")
-            processed_path = f"users/{task.user_id}/processed/{doc_id}.txt"
-            minio_client.put_object(
-                bucket_name="documents",
-                object_name=processed_path,
-                data=io.BytesIO(text.encode()),
-                length=len(text),
+    async def _recognize_pdf(self, task: OCRTaskSchema, path: str) -> tuple[str, int]:
+        pages_total = await asyncio.to_thread(ocr.count_pdf_pages, path)
+        prefix = get_pages_prefix(task.user_id, task.doc_id)
+        pages = await self._load_checkpoints(prefix)
+        await self._update_progress(
+            task.doc_id, pages_total=pages_total, pages_done=len(pages)
+        )
+        missing = [
+            number for number in range(1, pages_total + 1) if number not in pages
+        ]
+        semaphore = asyncio.Semaphore(settings.OCR_PDF_PARALLEL_WINDOWS)
+
+        async def recognize_window(first_page: int, last_page: int):
+            async with semaphore:
+                recognized = await self._run_in_executor(
+                    ocr.recognize_pdf_pages, path, first_page, last_page, self.options
+                )
+            await asyncio.gather(
+                *(self._save_checkpoint(prefix, page) for page in recognized)
             )
+            pages.update((page.number, page) for page in recognized)
+            await self._update_progress(task.doc_id, pages_done=len(pages))
 
-            # await es_client.index(
-            #     index="documents",
-            #     id=str(doc_id),
-            #     document={
-            #         "text": text,
-            #         "user_id": task.user_id,
-            #         "original_path": task.file_path,
-            #     },
-            # )
-
-            doc = await session.get(DocumentModel, doc_id)
-            if doc:
-                doc.status = "processed"
-                doc.processed_path = processed_path
-                doc.processed_text = text
-                await session.commit()
-            else:
-                raise ValueError(f"Document with id {doc_id} not found")
+        await self._run_all(
+            recognize_window(first_page, last_page)
+            for first_page, last_page in ocr.page_runs(missing, settings.OCR_PDF_WINDOW)
+        )
+        text = "\n".join(pages[number].text for number in range(1, pages_total + 1))
+        return text, pages_total
 
-        except Exception as e:
-            raise e
+    async def _recognize_image(self, path: str) -> str:
+        tiles = await self._run_in_executor(
+            ocr.plan_image_tiles, path, f"{path}.tiles", self.options
+        )
+        if not tiles:
+            return await self._run_in_executor(ocr.recognize_image, path, self.options)
+        if len(tiles) == 1:
+            return await self._run_in_executor(ocr.recognize_tile, tiles[0].path)
+
+        texts = await self._run_all(
+            self._run_in_executor(ocr.recognize_tile, tile.path) for tile in tiles
+        )
+        return stitch_tiles(tiles, texts, self.options.tiling.max_seam_lines)
+
+    async def _recognize(self, task: OCRTaskSchema, path: str) -> OCRResult:
+        if task.file_path.endswith(".pdf"):
+            text, pages_total = await self._recognize_pdf(task, path)
+        else:
+            text, pages_total = await self._recognize_image(path), 1
+            prefix = get_pages_prefix(task.user_id, task.doc_id)
+            await self._save_checkpoint(prefix, ocr.PageText(1, text, "ocr"))
+            await self._update_progress(task.doc_id, pages_total=1, pages_done=1)
+        return OCRResult(text, task.user_id, task.doc_id, pages_total)
+
+    async def _copy_pages(self, task: OCRTaskSchema, result: OCRResult):
+        if result.doc_id == task.doc_id:
+            return
+        source_prefix = get_pages_prefix(result.user_id, result.doc_id)
+        prefix = get_pages_prefix(task.user_id, task.doc_id)
+        names = await storage.list_objects(source_prefix)
+        if names:
+            await asyncio.gather(
+                *(
+                    storage.copy_object(name, prefix + name[len(source_prefix) :])
+                    for name in names
+                )
+            )
+            pages_total = result.pages_total or len(names)
+        else:
+            # Processed before page checkpoints existed.
+            await self._save_checkpoint(prefix, ocr.PageText(1, result.text, "ocr"))
+            pages_total = 1
+        await self._update_progress(
+            task.doc_id, pages_total=pages_total, pages_done=pages_total
+        )
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    async def _load_result(self, task: OCRTaskSchema, doc: DocumentModel) -> OCRResult:
+        with tempfile.TemporaryDirectory(dir=settings.OCR_TMP_DIR) as tmp_dir:
+            path = os.path.join(tmp_dir, os.path.basename(task.file_path))
+            if doc.content_hash is None:
+                await storage.download_file(task.file_path, path)
+                doc.content_hash = await asyncio.to_thread(self._hash_file, path)
+
+            async def lookup() -> OCRResult | None:
+                source = await documents_crud.get_processed_document_by_hash(
+                    self.session, doc.content_hash
+                )
+                if source is None:
+                    return None
+                return OCRResult(
+                    source.processed_text,
+                    source.user_id,
+                    source.id,
+                    source.pages_total,
+                )
+
+            async def compute() -> OCRResult:
+                if not os.path.exists(path):
+                    await storage.download_file(task.file_path, path)
+                return await self._recognize(task, path)
+
+            return await self.cache.get_or_compute(doc.content_hash, lookup, compute)
+
+    async def _save_text(self, task: OCRTaskSchema, text: str) -> str:
+        processed_path = f"users/{task.user_id}/processed/{task.doc_id}.txt"
+        await storage.put_bytes(processed_path, text.encode())
+        return processed_path
+
+    async def mark_failed(self, task: OCRTaskSchema, retry: bool):
+        await self.session.rollback()
+        doc = await self.session.get(DocumentModel, task.doc_id)
+        if doc:
+            status = DocumentStatus.QUEUED if retry else DocumentStatus.FAILED
+            await self._set_status(doc, status)
+
+    async def process_ocr(self, task: OCRTaskSchema):
+        doc_id = task.doc_id
+
+        doc = await self.session.get(DocumentModel, doc_id)
+        if not doc:
+            raise ValueError(f"Document with id {doc_id} not found")
+        if doc.status == DocumentStatus.PROCESSED:
+            return
+        await self._set_status(doc, DocumentStatus.PROCESSING)
+
+        result = await self._load_result(task, doc)
+        await self._copy_pages(task, result)
+        text = result.text
+        processed_path = await self._save_text(task, text)
+
+        doc.status = DocumentStatus.PROCESSED
+        doc.processed_path = processed_path
+        doc.processed_text = text
+        await self.session.commit()
+
+        if self.indexer is not None:
+            self.indexer.add(doc_id, task.user_id, task.file_path, text)
+
+
+class TaskPublisher:
+    def __init__(self, broker_mq: RabbitBroker):
+        self.broker_mq = broker_mq
+
+    async def publish(self, task: OCRTaskSchema):
+        await self.broker_mq.publish(task, queue=OCR_QUEUES[task.priority])
+
+    async def publish_batch(self, tasks: Sequence[OCRTaskSchema]):
+        await asyncio.gather(*(self.publish(task) for task in tasks))
+
+    async def publish_delayed(self, task: OCRTaskSchema, delay: float):
+        # Messages wait out the delay in a queue of their own and are then
+        # dead-lettered back into the task's lane, so no consumer holds them.
+        # One queue per delay keeps a long TTL from blocking shorter ones.
+        target = OCR_QUEUES[task.priority]
+        delay_ms = int(delay * 1000)
+        queue = RabbitQueue(
+            f"{target}.retry.{delay_ms}",
+            durable=True,
+            arguments={
+                "x-message-ttl": delay_ms,
+                "x-dead-letter-exchange": "",
+                "x-dead-letter-routing-key": target,
+            },
+        )
+        await self.broker_mq.declare_queue(queue)
+        await self.broker_mq.publish(task, queue=queue.name)
+
+    async def publish_dead(self, task: OCRTaskSchema, error: str):
+        await self.broker_mq.publish(
+            task, queue=DEAD_LETTER_QUEUE, headers={"x-error": error}
+        )
+
+
+class PresignedUploadManager:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_upload(
+        self, user_id: UUID, filename: str
+    ) -> PresignedUploadSchema:
+        doc_id = uuid4()
+        filename = os.path.basename(filename)
+        file_path = f"users/{user_id}/original/{doc_id}_{filename}"
+        expires = timedelta(seconds=settings.MINIO_PRESIGNED_EXPIRE_SECONDS)
+
+        await FileManager._create_minio_bucket()
+        upload_url = minio_public_client.presigned_put_object(
+            "documents", file_path, expires=expires
+        )
+
+        doc = DocumentModel(
+            id=doc_id,
+            user_id=user_id,
+            original_path=file_path,
+            status=DocumentStatus.PENDING_UPLOAD,
+        )
+        self.session.add(doc)
+        await self.session.commit()
+        return PresignedUploadSchema(
+            doc_id=doc_id,
+            upload_url=upload_url,
+            expires_in=settings.MINIO_PRESIGNED_EXPIRE_SECONDS,
+        )
+
+    async def complete_upload(self, doc_id: UUID, broker_mq: RabbitBroker) -> str:
+        doc = await documents_crud.get_document_by_id(self.session, doc_id)
+        if doc.status != DocumentStatus.PENDING_UPLOAD:
+            return doc.status
+
+        task_schema = OCRTaskSchema(
+            doc_id=doc.id, user_id=doc.user_id, file_path=doc.original_path
+        )
+        try:
+            stat = await storage.stat_object(doc.original_path)
+        except S3Error:
+            raise DOCUMENT_NOT_UPLOADED_EXCEPTION
+
+        if stat.size > settings.MAX_UPLOAD_SIZE:
+            await storage.remove_object(doc.original_path)
+            doc.status = DocumentStatus.FAILED
+            await self.session.commit()
+            raise FILE_TOO_LARGE_EXCEPTION
+
+        doc.status = DocumentStatus.QUEUED
+        await self.session.commit()
+        task_schema.priority = await choose_priority(
+            self.session, task_schema.user_id, stat.size
+        )
+        await TaskPublisher(broker_mq).publish(task_schema)
+        return DocumentStatus.QUEUED
+
+
+class DocumentSearchManager:
+    def __init__(self, session: AsyncSession, user_id: UUID):
+        self.session = session
+        self.user_id = user_id
+
+    async def _search_elasticsearch(
+        self, query: str, page: int, size: int
+    ) -> DocumentSearchResultSchema:
+        response = await es_client.search(
+            index=settings.ES_INDEX,
+            query={
+                "bool": {
+                    "filter": [{"term": {"user_id": str(self.user_id)}}],
+                    "must": [{"match": {"text": query}}],
+                }
+            },
+            highlight={"fields": {"text": {}}},
+            source=False,
+            from_=(page - 1) * size,
+            size=size,
+        )
+        hits = response["hits"]
+        return DocumentSearchResultSchema(
+            total=hits["total"]["value"],
+            page=page,
+            size=size,
+            items=[
+                DocumentSearchHitSchema(
+                    doc_id=hit["_id"],
+                    score=hit["_score"],
+                    highlights=hit.get("highlight", {}).get("text", []),
+                )
+                for hit in hits["hits"]
+            ],
+        )
+
+    async def _search_postgres(
+        self, query: str, page: int, size: int
+    ) -> DocumentSearchResultSchema:
+        total, rows = await documents_crud.search_documents(
+            self.session,
+            self.user_id,
+            query,
+            limit=size,
+            offset=(page - 1) * size,
+        )
+        return DocumentSearchResultSchema(
+            total=total,
+            page=page,
+            size=size,
+            items=[
+                DocumentSearchHitSchema(
+                    doc_id=row.id,
+                    score=row.score,
+                    highlights=[row.headline] if row.headline else [],
+                )
+                for row in rows
+            ],
+        )
+
+    async def search(
+        self, query: str, page: int, size: int
+    ) -> DocumentSearchResultSchema:
+        if settings.SEARCH_BACKEND == "postgres":
+            return await self._search_postgres(query, page, size)
+        return await self._search_elasticsearch(query, page, size)
+
+
+class DocumentEventsManager:
+    def __init__(self, doc_id: UUID):
+        self.doc_id = doc_id
+
+    async def ensure_exists(self):
+        # A short session of its own: a request-scoped one would stay checked
+        # out for as long as the stream is open.
+        async with async_session_maker() as session:
+            await documents_crud.get_document_by_id(session, self.doc_id)
+
+    @staticmethod
+    def _format_event(event: str, data: dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    async def stream(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.DOCUMENT_EVENTS_TIMEOUT
+        last_status, last_pages_done = None, None
+
+        while loop.time() < deadline:
+            async with async_session_maker() as session:
+                progress = await documents_crud.get_document_progress(
+                    session, self.doc_id
+                )
+            if progress is None:
+                yield self._format_event("error", {"detail": "not found"})
+                return
+            data = {
+                "doc_id": str(self.doc_id),
+                "status": progress.status,
+                "pages_total": progress.pages_total,
+                "pages_done": progress.pages_done,
+            }
+            if progress.status != last_status:
+                last_status = progress.status
+                yield self._format_event("status", data)
+            elif progress.pages_done != last_pages_done:
+                yield self._format_event("progress", data)
+            last_pages_done = progress.pages_done
+            if progress.status in (DocumentStatus.PROCESSED, DocumentStatus.FAILED):
+                return
+            await asyncio.sleep(settings.DOCUMENT_EVENTS_POLL_INTERVAL)
+
+
+class DocumentPagesManager:
+    def __init__(self, session: AsyncSession, doc_id: UUID):
+        self.session = session
+        self.doc_id = doc_id
+
+    async def get_pages(self, after: int, limit: int) -> DocumentPagesSchema:
+        doc = await documents_crud.get_document_by_id(self.session, self.doc_id)
+        prefix = get_pages_prefix(doc.user_id, doc.id)
+        names = sorted(await storage.list_objects(prefix))
+        names = [
+            name for name in names if int(os.path.basename(name).split(".")[0]) > after
+        ][:limit]
+        checkpoints = await asyncio.gather(*(storage.get_bytes(name) for name in names))
+        return DocumentPagesSchema(
+            status=doc.status,
+            pages_total=doc.pages_total,
+            pages_done=doc.pages_done,
+            pages=[json.loads(data) for data in checkpoints],
+        )
+
+
+class UploadStream:
+    def __init__(self, file: BinaryIO, max_size: int):
+        self.file = file
+        self.max_size = max_size
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.file.read(size)
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise FILE_TOO_LARGE_EXCEPTION
+        self.sha256.update(chunk)
+        return chunk
 
 
 class FileManager:
@@ -76,64 +545,142 @@ class FileManager:
         self.file_path = (
             f"users/{self.user_id}/original/{self.doc_id}_{self.file.filename}"
         )
-        self._file_data: Optional[bytes] = None
-
-    async def _read_file(self):
-        if self._file_data is None:
-            self._file_data = await self.file.read()
+        self.size: Optional[int] = None
+        self.sha256: Optional[str] = None
 
     @staticmethod
     async def _create_minio_bucket():
         try:
-            if not minio_client.bucket_exists("documents"):
-                minio_client.make_bucket("documents")
+            await storage.ensure_bucket()
         except S3Error as e:
             print(f"Error creating minio bucket: {e}")  # реализовать logger
 
     async def _download_file(self):
-        await self._read_file()
+        await self._create_minio_bucket()
 
-        file_obj = io.BytesIO(self._file_data)
-        file_obj.seek(0)
+        await self.file.seek(0)
+        stream = UploadStream(self.file.file, settings.MAX_UPLOAD_SIZE)
+        await storage.put_object(
+            self.file_path, stream, part_size=settings.MINIO_PART_SIZE
+        )
+        self.size = stream.size
+        self.sha256 = stream.sha256.hexdigest()
 
-        await self._create_minio_bucket()
+    def _document_values(self) -> dict:
+        return {
+            "id": self.doc_id,
+            "user_id": self.user_id,
+            "original_path": self.file_path,
+            "content_hash": self.sha256,
+            "status": DocumentStatus.QUEUED,
+        }
 
-        minio_client.put_object(
-            bucket_name="documents",
-            object_name=self.file_path,
-            data=file_obj,
-            length=len(self._file_data),
+    def _task_schema(self, priority: TaskPriority = TaskPriority.BULK) -> OCRTaskSchema:
+        return OCRTaskSchema(
+            doc_id=self.doc_id,
+            user_id=self.user_id,
+            file_path=self.file_path,
+            priority=priority,
         )
 
     async def _upload_file(self, session: AsyncSession):
         try:
-            doc = DocumentModel(
-                id=self.doc_id,
-                user_id=self.user_id,
-                original_path=self.file_path,
-                status="uploaded",
-            )
+            doc = DocumentModel(**self._document_values())
             session.add(doc)
             await session.commit()
-            await session.refresh(doc)
             return doc
         except Exception as e:
             await session.rollback()
             raise ValueError(f"Failed to upload document:")
 
-    async def _send_file_to_broker(self, broker_mq):
-        task_schema = OCRTaskSchema(
-            doc_id=self.doc_id, user_id=self.user_id, file_path=self.file_path
-        )
-        await broker_mq.publish(
-            task_schema,
-            queue="ocr_tasks",
-        )
+    async def _send_file_to_broker(self, broker_mq, priority: TaskPriority):
+        task_schema = self._task_schema(priority)
+        await TaskPublisher(broker_mq).publish(task_schema)
         return task_schema
 
     async def execute_task(self, session: AsyncSession, broker_mq: RabbitBroker):
         await self._download_file()
         await self._upload_file(session)
-        task = await self._send_file_to_broker(broker_mq)
-        manager = OCRManager()
-        await manager.process_ocr(task, session)
+        priority = await choose_priority(session, self.user_id, self.size)
+        await self._send_file_to_broker(broker_mq, priority)
+
+
+class BatchUploadManager:
+    def __init__(self, files: list[UploadFile], user_id: UUID):
+        self.files = files
+        self.user_id = user_id
+        self._archives: list[zipfile.ZipFile] = []
+
+    def _expand_archive(self, file: UploadFile) -> list[UploadFile]:
+        archive = zipfile.ZipFile(file.file)
+        self._archives.append(archive)
+        return [
+            UploadFile(
+                file=archive.open(info),
+                filename=os.path.basename(info.filename),
+                size=info.file_size,
+            )
+            for info in archive.infolist()
+            if not info.is_dir()
+        ]
+
+    def _expand_files(self) -> list[UploadFile]:
+        files = []
+        for file in self.files:
+            if file.filename and file.filename.lower().endswith(".zip"):
+                files.extend(self._expand_archive(file))
+            else:
+                files.append(file)
+        if len(files) > settings.MAX_BATCH_FILES:
+            raise TOO_MANY_FILES_EXCEPTION
+        return files
+
+    @staticmethod
+    async def _store(manager: FileManager, semaphore: asyncio.Semaphore) -> str | None:
+        async with semaphore:
+            try:
+                await manager._download_file()
+            except HTTPException as e:
+                return e.detail
+            except Exception as e:
+                return str(e)
+        return None
+
+    async def execute_task(
+        self, session: AsyncSession, broker_mq: RabbitBroker
+    ) -> list[BatchUploadResultSchema]:
+        try:
+            files = await asyncio.to_thread(self._expand_files)
+        except zipfile.BadZipFile:
+            raise INVALID_ARCHIVE_EXCEPTION
+
+        try:
+            managers = [FileManager(file, self.user_id) for file in files]
+            await FileManager._create_minio_bucket()
+            semaphore = asyncio.Semaphore(settings.UPLOAD_BATCH_CONCURRENCY)
+            errors = await asyncio.gather(
+                *(self._store(manager, semaphore) for manager in managers)
+            )
+        finally:
+            for archive in self._archives:
+                archive.close()
+
+        stored = [manager for manager, error in zip(managers, errors) if not error]
+        if stored:
+            await session.execute(
+                insert(DocumentModel),
+                [manager._document_values() for manager in stored],
+            )
+            await session.commit()
+            await TaskPublisher(broker_mq).publish_batch(
+                [manager._task_schema() for manager in stored]
+            )
+
+        return [
+            BatchUploadResultSchema(
+                filename=manager.file.filename,
+                doc_id=None if error else manager.doc_id,
+                error=error,
+            )
+            for manager, error in zip(managers, errors)
+        ]
@@ -0,0 +1,35 @@
+import asyncio
+import time
+
+from faststream.rabbit import RabbitBroker, RabbitQueue
+
+
+class QueueMonitor:
+    def __init__(self, broker: RabbitBroker, ttl: float):
+        self.broker = broker
+        self.ttl = ttl
+        self._depths: dict[str, tuple[float, int]] = {}
+        self._lock = asyncio.Lock()
+
+    async def _fetch_depth(self, name: str) -> int:
+        # Declaring with the consumer's arguments is idempotent and also works
+        # before the worker has created the queue. FastStream caches the queue
+        # object, so declare it again to get a fresh message count.
+        queue = await self.broker.declare_queue(RabbitQueue(name))
+        result = await queue.declare()
+        return result.message_count
+
+    async def get_depth(self, name: str) -> int:
+        cached = self._depths.get(name)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+        async with self._lock:
+            cached = self._depths.get(name)
+            if cached is not None and time.monotonic() - cached[0] < self.ttl:
+                return cached[1]
+            depth = await self._fetch_depth(name)
+            self._depths[name] = (time.monotonic(), depth)
+            return depth
+
+    async def get_total_depth(self, names) -> int:
+        return sum([await self.get_depth(name) for name in names])
@@ -1,10 +1,11 @@
 from fastapi import APIRouter
 
-from app.api.routers import users, auth, documents
+from app.api.routers import users, auth, documents, metrics
 
 router = APIRouter()
 router.include_router(users.router)
 router.include_router(auth.router)
 router.include_router(documents.router)
+router.include_router(metrics.router)
 
 __all__ = ("router",)
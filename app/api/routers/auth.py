@@ -2,8 +2,8 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Response
 
-from app.api.deps import SessionDep
-from app.api.utils import Authorization
+from app.api.deps import SessionDep, get_token
+from app.api.utils import Authorization, token_verifier
 from app.api.request_forms import OAuth2EmailRequestForm
 
 
@@ -24,6 +24,8 @@ async def login(
 
 
 @router.post("/logout")
-def logout(response: Response):
+async def logout(response: Response, token: str | None = Depends(get_token)):
+    if token:
+        await token_verifier.revoke(token)
     response.delete_cookie("token")
     return {"message": "Successfully logged out", "ok": True}
@@ -1,15 +1,31 @@
 from uuid import UUID
 
-from fastapi import APIRouter, UploadFile, Depends
+from fastapi import APIRouter, UploadFile, Depends, Query
+from fastapi.responses import StreamingResponse
 
-from app.api.deps import SessionDep, get_broker
-from app.api.managers import FileManager
+from app.api.deps import SessionDep, check_ocr_backlog, get_broker
+from app.api.managers import (
+    BatchUploadManager,
+    DocumentEventsManager,
+    DocumentPagesManager,
+    DocumentSearchManager,
+    FileManager,
+    PresignedUploadManager,
+)
+from app.crud import documents_crud
+from app.schemas import (
+    BatchUploadResultSchema,
+    DocumentPagesSchema,
+    DocumentResponseSchema,
+    DocumentSearchResultSchema,
+    PresignedUploadSchema,
+)
 
 
 router = APIRouter(tags=["documents"], prefix="/document")
 
 
-@router.post("/upload")
+@router.post("/upload", dependencies=[Depends(check_ocr_backlog)])
 async def upload_file(
     session: SessionDep,
     file: UploadFile,
@@ -19,3 +35,78 @@ async def upload_file(
     manager = FileManager(file, user_id)
     await manager.execute_task(session, broker_mq)
     return {"doc_id": manager.doc_id, "status": "queued"}
+
+
+@router.post(
+    "/upload/batch",
+    response_model=list[BatchUploadResultSchema],
+    dependencies=[Depends(check_ocr_backlog)],
+)
+async def upload_files(
+    session: SessionDep,
+    files: list[UploadFile],
+    user_id: UUID,
+    broker_mq=Depends(get_broker),
+):
+    manager = BatchUploadManager(files, user_id)
+    return await manager.execute_task(session, broker_mq)
+
+
+@router.post(
+    "/upload/presigned",
+    response_model=PresignedUploadSchema,
+    dependencies=[Depends(check_ocr_backlog)],
+)
+async def create_presigned_upload(session: SessionDep, user_id: UUID, filename: str):
+    manager = PresignedUploadManager(session)
+    return await manager.create_upload(user_id, filename)
+
+
+@router.post("/{doc_id}/complete")
+async def complete_presigned_upload(
+    session: SessionDep,
+    doc_id: UUID,
+    broker_mq=Depends(get_broker),
+):
+    manager = PresignedUploadManager(session)
+    status = await manager.complete_upload(doc_id, broker_mq)
+    return {"doc_id": doc_id, "status": status}
+
+
+@router.get("/search", response_model=DocumentSearchResultSchema)
+async def search_documents(
+    session: SessionDep,
+    user_id: UUID,
+    q: str = Query(min_length=1),
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+):
+    manager = DocumentSearchManager(session, user_id)
+    return await manager.search(q, page, size)
+
+
+@router.get("/{doc_id}", response_model=DocumentResponseSchema)
+async def get_document(session: SessionDep, doc_id: UUID):
+    return await documents_crud.get_document_by_id(session, doc_id)
+
+
+@router.get("/{doc_id}/events")
+async def document_events(doc_id: UUID):
+    manager = DocumentEventsManager(doc_id)
+    await manager.ensure_exists()
+    return StreamingResponse(
+        manager.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{doc_id}/pages", response_model=DocumentPagesSchema)
+async def get_document_pages(
+    session: SessionDep,
+    doc_id: UUID,
+    after: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+):
+    manager = DocumentPagesManager(session, doc_id)
+    return await manager.get_pages(after, limit)
@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+
+from app.api.security import password_hasher
+from app.api.utils import token_verifier
+from app.core.database import engine
+
+
+router = APIRouter(tags=["metrics"], prefix="/metrics")
+
+
+@router.get("")
+async def get_metrics():
+    return {
+        "password_hashing": password_hasher.stats(),
+        "token_cache": token_verifier.cache.stats(),
+        "db_pool": engine.pool.stats(),
+    }
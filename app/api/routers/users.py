@@ -1,11 +1,17 @@
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from pydantic import EmailStr
 
-from app.api.deps import SessionDep
-from app.crud import users_crud
-from app.schemas import UserCreateSchema, UserUpdateSchema
+from app.api.deps import CurrentUser, SessionDep
+from app.crud import documents_crud, users_crud
+from app.models import DocumentStatus
+from app.schemas import (
+    CurrentUserSchema,
+    DocumentListSchema,
+    UserCreateSchema,
+    UserUpdateSchema,
+)
 
 
 router = APIRouter(tags=["users"], prefix="/user")
@@ -17,6 +23,11 @@ async def create_user(session: SessionDep, user_data: UserCreateSchema):
     return {"ok": True}
 
 
+@router.get("/me", response_model=CurrentUserSchema)
+async def get_me(user: CurrentUser):
+    return user
+
+
 @router.get("/{email}")
 async def get_user(session: SessionDep, email: EmailStr):
     user = await users_crud.get_user_by_email(session, email)
@@ -33,3 +44,17 @@ async def update_user(session: SessionDep, user_data: UserUpdateSchema, user_id:
 async def delete_user(session: SessionDep, user_id: UUID):
     await users_crud.delete_user(session, user_id)
     return {"ok": True}
+
+
+@router.get("/{user_id}/documents", response_model=DocumentListSchema)
+async def get_user_documents(
+    session: SessionDep,
+    user_id: UUID,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    status: list[DocumentStatus] | None = Query(None),
+):
+    docs, next_cursor = await documents_crud.list_user_documents(
+        session, user_id, limit, cursor, status
+    )
+    return DocumentListSchema(items=docs, next_cursor=next_cursor)
@@ -1,9 +1,97 @@
-from passlib.hash import pbkdf2_sha256
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+from passlib.context import CryptContext
 
-def get_password_hash(password: str) -> str:
-    return pbkdf2_sha256.hash(password)
+from app.api.exceptions import PASSWORD_HASHING_BUSY_EXCEPTION
+from app.core.config import settings
 
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    pbkdf2_sha256__rounds=settings.PASSWORD_HASH_ROUNDS,
+)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pbkdf2_sha256.verify(plain_password, hashed_password)
+
+class PasswordHasher:
+    """Runs password hashing off the event loop with bounded concurrency."""
+
+    def __init__(self, context: CryptContext, max_workers: int, max_queue: int):
+        self.context = context
+        self.max_queue = max_queue
+        # hashlib releases the GIL while deriving keys, so threads are enough.
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hash",
+        )
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._waiting = 0
+        self._running = 0
+        self._calls = 0
+        self._rejected = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+        self._run_time = 0.0
+
+    async def _run(self, func, *args):
+        if self._waiting >= self.max_queue:
+            self._rejected += 1
+            raise PASSWORD_HASHING_BUSY_EXCEPTION
+
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        started_at = time.perf_counter()
+        self._wait_time += started_at - queued_at
+        self._max_wait = max(self._max_wait, started_at - queued_at)
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self._running -= 1
+            self._calls += 1
+            self._run_time += time.perf_counter() - started_at
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        return await self._run(
+            self.context.verify_and_update, password, hashed_password
+        )
+
+    def stats(self) -> dict:
+        return {
+            "waiting": self._waiting,
+            "running": self._running,
+            "calls": self._calls,
+            "rejected": self._rejected,
+            "avg_wait_seconds": self._wait_time / self._calls if self._calls else 0.0,
+            "max_wait_seconds": self._max_wait,
+            "avg_run_seconds": self._run_time / self._calls if self._calls else 0.0,
+        }
+
+
+password_hasher = PasswordHasher(
+    pwd_context,
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    return await password_hasher.verify_and_update(plain_password, hashed_password)
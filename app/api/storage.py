@@ -0,0 +1,106 @@
+import asyncio
+import functools
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO
+
+import certifi
+import urllib3
+from minio import Minio
+from minio.commonconfig import CopySource
+from minio.datatypes import Object
+
+
+def create_http_client(pool_size: int, timeout: float) -> urllib3.PoolManager:
+    return urllib3.PoolManager(
+        maxsize=pool_size,
+        block=True,
+        timeout=urllib3.Timeout(connect=timeout, read=timeout),
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=certifi.where(),
+        retries=urllib3.Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+    )
+
+
+class AsyncStorage:
+    def __init__(self, client: Minio, bucket: str, max_workers: int):
+        self.client = client
+        self.bucket = bucket
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="storage",
+        )
+        self._bucket_ready = False
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def ensure_bucket(self):
+        if self._bucket_ready:
+            return
+        if not await self._run(self.client.bucket_exists, self.bucket):
+            await self._run(self.client.make_bucket, self.bucket)
+        self._bucket_ready = True
+
+    async def put_object(
+        self,
+        object_name: str,
+        data: BinaryIO,
+        length: int = -1,
+        part_size: int = 0,
+    ):
+        return await self._run(
+            self.client.put_object,
+            bucket_name=self.bucket,
+            object_name=object_name,
+            data=data,
+            length=length,
+            part_size=part_size,
+        )
+
+    async def put_bytes(self, object_name: str, data: bytes):
+        return await self.put_object(object_name, io.BytesIO(data), len(data))
+
+    async def get_bytes(self, object_name: str) -> bytes:
+        def read():
+            response = self.client.get_object(self.bucket, object_name)
+            try:
+                return response.read()
+            finally:
+                response.close()
+                response.release_conn()
+
+        return await self._run(read)
+
+    async def download_file(self, object_name: str, file_path: str):
+        return await self._run(
+            self.client.fget_object, self.bucket, object_name, file_path
+        )
+
+    async def stat_object(self, object_name: str) -> Object:
+        return await self._run(self.client.stat_object, self.bucket, object_name)
+
+    async def copy_object(self, source_name: str, object_name: str):
+        return await self._run(
+            self.client.copy_object,
+            self.bucket,
+            object_name,
+            CopySource(self.bucket, source_name),
+        )
+
+    async def remove_object(self, object_name: str):
+        return await self._run(self.client.remove_object, self.bucket, object_name)
+
+    async def list_objects(self, prefix: str) -> list[str]:
+        def list_names():
+            objects = self.client.list_objects(self.bucket, prefix, recursive=True)
+            return [obj.object_name for obj in objects]
+
+        return await self._run(list_names)
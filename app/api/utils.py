@@ -1,15 +1,26 @@
+import hashlib
+import logging
+import time
 from datetime import timedelta, datetime
 import jwt
 
 from fastapi import Response
+from pydantic import ValidationError
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.exceptions import INCORRECT_DATA_EXCEPTION
+from app.api.exceptions import (
+    INCORRECT_DATA_EXCEPTION,
+    NOT_AUTHENTICATED_EXCEPTION,
+)
 from app.api.request_forms import OAuth2EmailRequestForm
-from app.api.security import verify_password
+from app.api.security import verify_and_update_password
+from app.core.cache import CacheBackend, MemoryCacheBackend, TTLCache
 from app.core.config import settings
 from app.crud import users_crud
+from app.schemas import CurrentUserSchema
+
+logger = logging.getLogger(__name__)
 
 
 class JWTAuthenticator:
@@ -42,6 +53,66 @@ class JWTAuthenticator:
         return jwt.decode(payload, key, algorithm)
 
 
+class TokenVerifier:
+    """Verifies tokens through a local cache of principals.
+
+    Revocations live in ``revoked``. The default in-memory backend is per
+    process, so a logout is only seen by the API process that handled it;
+    plug in a shared CacheBackend to revoke across processes.
+    """
+
+    def __init__(self, cache: TTLCache, revoked: CacheBackend | None = None):
+        self.cache = cache
+        self.revoked = revoked
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    async def verify(self, token: str) -> CurrentUserSchema:
+        key = self._digest(token)
+        if self.revoked is not None and await self.revoked.get(key):
+            raise NOT_AUTHENTICATED_EXCEPTION
+        principal = self.cache.get(key)
+        if principal is not None:
+            return principal
+
+        try:
+            claims = JWTAuthenticator.decode_jwt_token(token)
+            principal = CurrentUserSchema(**claims)
+        except (jwt.InvalidTokenError, ValidationError):
+            raise NOT_AUTHENTICATED_EXCEPTION
+        # Never keep a principal in the cache past the token's own expiry.
+        self.cache.set(key, principal, claims["exp"] - time.time())
+        return principal
+
+    async def revoke(self, token: str) -> None:
+        key = self._digest(token)
+        self.cache.delete(key)
+        if self.revoked is None:
+            return
+        # Only tokens we issued are worth remembering; anything else would let
+        # unauthenticated callers fill the list.
+        try:
+            claims = JWTAuthenticator.decode_jwt_token(token)
+        except jwt.InvalidTokenError:
+            return
+        if not await self.revoked.set(key, "1", claims["exp"] - time.time()):
+            logger.warning("Token revocation list is full, token not revoked")
+
+
+token_verifier = TokenVerifier(
+    TTLCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL),
+    MemoryCacheBackend(
+        settings.TOKEN_REVOCATION_MAX_SIZE,
+        timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES).total_seconds(),
+        evict=False,
+    )
+    if settings.TOKEN_REVOCATION_ENABLED
+    else None,
+)
+
+
 class Authorization:
     @staticmethod
     async def login(
@@ -49,11 +120,18 @@ class Authorization:
         form_data: OAuth2EmailRequestForm,
         response: Response,
     ):
-        user = await users_crud.get_user_by_email(session, form_data.username)
+        user = await users_crud.get_user_by_email(
+            session, form_data.username, cached=False
+        )
         if not user:
             raise INCORRECT_DATA_EXCEPTION
-        if not verify_password(form_data.password, user.hashed_password):
+        verified, new_hash = await verify_and_update_password(
+            form_data.password, user.hashed_password
+        )
+        if not verified:
             raise INCORRECT_DATA_EXCEPTION
+        if new_hash is not None:
+            await users_crud.update_password_hash(session, user.id, new_hash)
 
         user_data = {
             "id": str(user.id),
@@ -0,0 +1,94 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Protocol
+
+
+class TTLCache:
+    """In-process LRU cache whose entries also expire after a TTL.
+
+    With ``evict=False`` live entries are never dropped to make room: expired
+    ones are purged instead, and ``set`` returns False when the cache is full.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, evict: bool = True):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.evict = evict
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            self._misses += 1
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self._misses += 1
+            return default
+        self._data.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            key for key, (expires_at, _) in self._data.items() if expires_at <= now
+        ]
+        for key in expired:
+            del self._data[key]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> bool:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return True
+        if not self.evict and key not in self._data and len(self._data) >= self.maxsize:
+            self._purge_expired()
+            if len(self._data) >= self.maxsize:
+                return False
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return True
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "hits": self._hits, "misses": self._misses}
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> str | None: ...
+
+    async def set(self, key: str, value: str, ttl: float) -> bool: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+
+class MemoryCacheBackend:
+    def __init__(self, maxsize: int, ttl: float, evict: bool = True):
+        self.cache = TTLCache(maxsize, ttl, evict)
+
+    async def get(self, key: str) -> str | None:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: float) -> bool:
+        return self.cache.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.cache.delete(key)
+
+    def stats(self) -> dict:
+        return self.cache.stats()
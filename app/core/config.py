@@ -1,3 +1,5 @@
+from typing import Literal
+
 from dotenv import load_dotenv
 from pydantic import (
     computed_field,
@@ -25,19 +27,96 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
 
     ECHO: bool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
 
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
+    PASSWORD_HASH_ROUNDS: int = 29000
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL: float = 60.0
+    TOKEN_REVOCATION_ENABLED: bool = True
+    TOKEN_REVOCATION_MAX_SIZE: int = 100000
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL: float = 60.0
+
     MINIO_ENDPOINT: str
     MINIO_ACCESS: str
     MINIO_SECRET: str
     MINIO_SECURE: bool
+    MINIO_PART_SIZE: int = 10 * 1024 * 1024
+    MINIO_POOL_SIZE: int = 32
+    MINIO_TIMEOUT: float = 60.0
+    MINIO_PUBLIC_ENDPOINT: str | None = None
+    MINIO_REGION: str = "us-east-1"
+    MINIO_PRESIGNED_EXPIRE_SECONDS: int = 3600
+
+    MAX_UPLOAD_SIZE: int = 200 * 1024 * 1024
+    MAX_BATCH_FILES: int = 1000
+    UPLOAD_BATCH_CONCURRENCY: int = 8
 
     RABBITMQ_URL: str
 
+    OCR_WORKER_PROCESSES: int | None = None
+    OCR_WORKER_CONCURRENCY: int = 4
+    OCR_WORKER_MIN_CONCURRENCY: int = 1
+    OCR_WORKER_MAX_CONCURRENCY: int = 8
+    OCR_ADAPT_INTERVAL: float = 5.0
+    OCR_CPU_HIGH: float = 0.9
+    OCR_CPU_LOW: float = 0.6
+    OCR_WORKER_PREFETCH: int = 8
+    OCR_INTERACTIVE_PROCESSES: int = 1
+    OCR_INTERACTIVE_CONCURRENCY: int = 2
+    OCR_INTERACTIVE_PREFETCH: int = 2
+    OCR_INTERACTIVE_MAX_SIZE: int = 5 * 1024 * 1024
+    OCR_USER_INTERACTIVE_LIMIT: int = 3
+    OCR_USER_MAX_INFLIGHT: int = 2
+    OCR_QUEUE_DEPTH_TTL: float = 2.0
+    OCR_BACKLOG_LIMIT: int = 5000
+    OCR_BACKLOG_RETRY_AFTER: int = 30
+    OCR_MAX_ATTEMPTS: int = 3
+    OCR_RETRY_DELAY: float = 5.0
+    OCR_MAX_CRASHES: int = 3
+    OCR_ENGINE: Literal["tesserocr", "pytesseract"] = "tesserocr"
+    OCR_LANG: str = "rus+eng"
+    OCR_TESSDATA_PATH: str | None = None
+    OCR_PDF_WINDOW: int = 4
+    OCR_PDF_PARALLEL_WINDOWS: int = 4
+    OCR_TEXT_LAYER_MIN_CHARS: int = 32
+    OCR_PDF_DPI: int = 200
+    OCR_PREPROCESS: bool = True
+    OCR_TARGET_DPI: int = 300
+    OCR_MAX_IMAGE_WIDTH: int = 4000
+    OCR_MAX_IMAGE_PIXELS: int | None = 8_000_000
+    OCR_BINARIZE: bool = True
+    OCR_DESKEW: bool = True
+    OCR_TILE_MIN_HEIGHT: int = 6000
+    OCR_TILE_HEIGHT: int = 2000
+    OCR_TILE_OVERLAP: int = 80
+    OCR_TMP_DIR: str | None = None
+    OCR_RENDER_DIR: str | None = None
+
+    DOCUMENT_EVENTS_POLL_INTERVAL: float = 1.0
+    DOCUMENT_EVENTS_TIMEOUT: float = 600.0
+
+    SEARCH_BACKEND: Literal["elasticsearch", "postgres"] = "elasticsearch"
+    # Read by the search_vector migration only. Changing it later needs a
+    # migration that redefines documents_fts_config() and backfills the column.
+    FTS_CONFIG: str = "russian"
+
     ES_LINK: str
+    ES_INDEX: str = "documents"
+    ES_BULK_SIZE: int = 500
+    ES_FLUSH_INTERVAL: float = 2.0
+    ES_MAX_BUFFER: int = 10000
 
     @computed_field
     @property
@@ -1,9 +1,66 @@
+import time
+
+from sqlalchemy.exc import TimeoutError
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
-engine = create_async_engine(str(settings.POSTGRES_URL_ASYNC), echo=settings.ECHO)
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long connection checkouts take."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            self._timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started_at
+            self._checkouts += 1
+            self._wait_time += waited
+            self._max_wait = max(self._max_wait, waited)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "checkouts": self._checkouts,
+            "timeouts": self._timeouts,
+            "avg_wait_seconds": (
+                self._wait_time / self._checkouts if self._checkouts else 0.0
+            ),
+            "max_wait_seconds": self._max_wait,
+        }
+
+
+engine = create_async_engine(
+    str(settings.POSTGRES_URL_ASYNC),
+    echo=settings.ECHO,
+    poolclass=InstrumentedPool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args={
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    },
+)
+
+async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
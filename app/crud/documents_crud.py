@@ -0,0 +1,169 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
+
+from fastapi import status, HTTPException
+
+from sqlalchemy import Row, func, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.exceptions import INVALID_CURSOR_EXCEPTION
+from app.models import DocumentModel, DocumentStatus
+
+
+async def get_document_by_id(
+    session: AsyncSession,
+    doc_id: UUID,
+) -> DocumentModel | None:
+    stmt = select(DocumentModel).where(DocumentModel.id == doc_id)
+    doc = await session.scalar(stmt)
+    if not doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Документ с таким id не найден",
+        )
+    return doc
+
+
+async def get_document_progress(
+    session: AsyncSession,
+    doc_id: UUID,
+) -> Row | None:
+    stmt = select(
+        DocumentModel.status,
+        DocumentModel.pages_total,
+        DocumentModel.pages_done,
+    ).where(DocumentModel.id == doc_id)
+    return (await session.execute(stmt)).one_or_none()
+
+
+async def update_document_progress(
+    session: AsyncSession,
+    doc_id: UUID,
+    **values: int,
+) -> None:
+    stmt = update(DocumentModel).where(DocumentModel.id == doc_id).values(**values)
+    await session.execute(stmt)
+    await session.commit()
+
+
+async def get_processed_document_by_hash(
+    session: AsyncSession,
+    content_hash: str,
+) -> Row | None:
+    stmt = (
+        select(
+            DocumentModel.id,
+            DocumentModel.user_id,
+            DocumentModel.processed_text,
+            DocumentModel.pages_total,
+        )
+        .where(
+            DocumentModel.content_hash == content_hash,
+            DocumentModel.status == DocumentStatus.PROCESSED,
+            DocumentModel.processed_text.is_not(None),
+        )
+        .limit(1)
+    )
+    result = await session.execute(stmt)
+    return result.first()
+
+
+async def search_documents(
+    session: AsyncSession,
+    user_id: UUID,
+    query: str,
+    limit: int,
+    offset: int,
+) -> tuple[int, list[Row]]:
+    # The configuration the search vectors were built with, not FTS_CONFIG,
+    # which only takes effect through a migration.
+    fts_config = func.documents_fts_config()
+    ts_query = func.websearch_to_tsquery(fts_config, query)
+    condition = (
+        DocumentModel.user_id == user_id,
+        DocumentModel.search_vector.bool_op("@@")(ts_query),
+    )
+
+    total = await session.scalar(
+        select(func.count()).select_from(DocumentModel).where(*condition)
+    )
+
+    ranked = (
+        select(
+            DocumentModel.id,
+            func.ts_rank_cd(DocumentModel.search_vector, ts_query).label("score"),
+        )
+        .where(*condition)
+        .order_by(func.ts_rank_cd(DocumentModel.search_vector, ts_query).desc())
+        .limit(limit)
+        .offset(offset)
+        .subquery()
+    )
+    stmt = (
+        select(
+            ranked.c.id,
+            ranked.c.score,
+            func.ts_headline(fts_config, DocumentModel.processed_text, ts_query).label(
+                "headline"
+            ),
+        )
+        .join(DocumentModel, DocumentModel.id == ranked.c.id)
+        .order_by(ranked.c.score.desc())
+    )
+    rows = (await session.execute(stmt)).all()
+    return total, list(rows)
+
+
+def encode_cursor(doc: DocumentModel) -> str:
+    payload = json.dumps([doc.created_at.isoformat(), str(doc.id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        created_at, doc_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), UUID(doc_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise INVALID_CURSOR_EXCEPTION
+
+
+async def list_user_documents(
+    session: AsyncSession,
+    user_id: UUID,
+    limit: int,
+    cursor: str | None = None,
+    statuses: Sequence[str] | None = None,
+) -> tuple[list[DocumentModel], str | None]:
+    stmt = select(DocumentModel).where(DocumentModel.user_id == user_id)
+    if statuses:
+        stmt = stmt.where(DocumentModel.status.in_(statuses))
+    if cursor:
+        stmt = stmt.where(
+            tuple_(DocumentModel.created_at, DocumentModel.id)
+            < tuple_(*decode_cursor(cursor))
+        )
+    stmt = stmt.order_by(
+        DocumentModel.created_at.desc(), DocumentModel.id.desc()
+    ).limit(limit + 1)
+
+    docs = list(await session.scalars(stmt))
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, encode_cursor(docs[-1])
+
+
+async def count_user_documents(
+    session: AsyncSession,
+    user_id: UUID,
+    statuses: Sequence[str],
+) -> int:
+    stmt = select(func.count()).where(
+        DocumentModel.user_id == user_id,
+        DocumentModel.status.in_(statuses),
+    )
+    return await session.scalar(stmt)
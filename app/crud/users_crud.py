@@ -4,12 +4,58 @@ from fastapi import status, HTTPException
 
 from pydantic import EmailStr
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.security import get_password_hash
+from app.core.cache import CacheBackend, MemoryCacheBackend
+from app.core.config import settings
 from app.models import UserModel
-from app.schemas import UserCreateSchema, UserUpdateSchema
+from app.schemas import UserCreateSchema, UserInDBSchema, UserUpdateSchema
+
+
+class UserCache:
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def _id_key(user_id: UUID) -> str:
+        return f"user:id:{user_id}"
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return f"user:email:{email}"
+
+    async def get_by_id(self, user_id: UUID) -> UserInDBSchema | None:
+        data = await self.backend.get(self._id_key(user_id))
+        if data is None:
+            return None
+        return UserInDBSchema.model_validate_json(data)
+
+    async def get_by_email(self, email: str) -> UserInDBSchema | None:
+        # The email key only points at the id entry, so invalidating a user by
+        # id is enough even when their email has changed since.
+        user_id = await self.backend.get(self._email_key(email))
+        if user_id is None:
+            return None
+        user = await self.get_by_id(user_id)
+        if user is None or user.email != email:
+            return None
+        return user
+
+    async def set(self, user: UserInDBSchema) -> None:
+        await self.backend.set(self._id_key(user.id), user.model_dump_json(), self.ttl)
+        await self.backend.set(self._email_key(user.email), str(user.id), self.ttl)
+
+    async def invalidate(self, user_id: UUID) -> None:
+        await self.backend.delete(self._id_key(user_id))
+
+
+user_cache = UserCache(
+    MemoryCacheBackend(settings.USER_CACHE_SIZE, settings.USER_CACHE_TTL),
+    settings.USER_CACHE_TTL,
+)
 
 
 async def create_user(
@@ -17,7 +63,7 @@ async def create_user(
     user_data: UserCreateSchema,
 ):
     new_user = user_data.model_dump(exclude={"password"})
-    new_user["hashed_password"] = get_password_hash(user_data.password)
+    new_user["hashed_password"] = await get_password_hash(user_data.password)
     user = UserModel(**new_user)
     session.add(user)
     await session.commit()
@@ -26,7 +72,14 @@ async def create_user(
 async def get_user_by_email(
     session: AsyncSession,
     email: EmailStr,
-) -> UserModel | None:
+    cached: bool = True,
+) -> UserInDBSchema:
+    # Credential checks pass cached=False: a password changed through another
+    # process must stop working immediately, not after USER_CACHE_TTL.
+    if cached:
+        user = await user_cache.get_by_email(email)
+        if user is not None:
+            return user
     stmt = select(UserModel).where(UserModel.email == email)
     user = await session.scalar(stmt)
     if not user:
@@ -34,13 +87,18 @@ async def get_user_by_email(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Пользователь с таким email не найден",
         )
+    user = UserInDBSchema.model_validate(user)
+    await user_cache.set(user)
     return user
 
 
 async def get_user_by_id(
     session: AsyncSession,
     user_id: UUID,
-) -> UserModel | None:
+) -> UserInDBSchema:
+    cached = await user_cache.get_by_id(user_id)
+    if cached is not None:
+        return cached
     stmt = select(UserModel).where(UserModel.id == user_id)
     user = await session.scalar(stmt)
     if not user:
@@ -48,37 +106,61 @@ async def get_user_by_id(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Пользователь с таким id не найден",
         )
+    user = UserInDBSchema.model_validate(user)
+    await user_cache.set(user)
     return user
 
 
+async def update_password_hash(
+    session: AsyncSession, user_id: UUID, hashed_password: str
+) -> None:
+    stmt = (
+        update(UserModel)
+        .where(UserModel.id == user_id)
+        .values(hashed_password=hashed_password)
+    )
+    await session.execute(stmt)
+    await session.commit()
+    await user_cache.invalidate(user_id)
+
+
 async def update_user(
     session: AsyncSession, new_user: UserUpdateSchema, user_id: UUID
-) -> UserModel | None:
-    user = await get_user_by_id(session, user_id)
+) -> UserInDBSchema:
+    new_user_data = new_user.model_dump(exclude_unset=True)
+    if "password" in new_user_data:
+        password = new_user_data["password"]
+        new_user_data["hashed_password"] = await get_password_hash(password)
+        del new_user_data["password"]
+    values = {key: value for key, value in new_user_data.items() if value != ""}
+    if not values:
+        return await get_user_by_id(session, user_id)
+
+    stmt = (
+        update(UserModel)
+        .where(UserModel.id == user_id)
+        .values(**values)
+        .returning(UserModel)
+    )
+    user = await session.scalar(stmt)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Пользователь с таким id не найден",
         )
-    new_user_data = new_user.model_dump(exclude_unset=True)
-    if "password" in new_user_data:
-        password = new_user_data["password"]
-        new_user_data["hashed_password"] = get_password_hash(password)
-        del new_user_data["password"]
-    for key, value in new_user_data.items():
-        if new_user_data[key] != "":
-            setattr(user, key, value)
+    user = UserInDBSchema.model_validate(user)
     await session.commit()
-    await session.refresh(user)
+    await user_cache.invalidate(user_id)
     return user
 
 
 async def delete_user(session: AsyncSession, user_id: UUID) -> None:
-    user = await get_user_by_id(session, user_id)
-    if not user:
+    stmt = delete(UserModel).where(UserModel.id == user_id).returning(UserModel.id)
+    deleted = await session.scalar(stmt)
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Пользователя не существует",
         )
-    await session.delete(user)
     await session.commit()
+    await user_cache.invalidate(user_id)
@@ -1,11 +1,21 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
+from app.api.clients import broker
 from app.api.routers import router as api_router
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await broker.connect()
+    yield
+    await broker.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(api_router)
 
@@ -1,7 +1,8 @@
 from app.models.users import UserModel
-from app.models.documents import DocumentModel
+from app.models.documents import DocumentModel, DocumentStatus
 
 __all__ = (
     "UserModel",
     "DocumentModel",
+    "DocumentStatus",
 )
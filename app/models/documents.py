@@ -1,7 +1,9 @@
+from enum import StrEnum
 from typing import TYPE_CHECKING
 from uuid import uuid4, UUID
 
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import FetchedValue, String, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
@@ -13,16 +15,39 @@ if TYPE_CHECKING:
     from app.models import UserModel
 
 
+class DocumentStatus(StrEnum):
+    PENDING_UPLOAD = "pending_upload"
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    PROCESSED = "processed"
+    FAILED = "failed"
+
+
 class DocumentModel(Base, TimestampMixin):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_documents_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[UUID] = mapped_column(default=uuid4, primary_key=True)
     user_id: Mapped[UUID] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
     original_path: Mapped[String] = mapped_column(String(255), nullable=False)
-    processed_text: Mapped[String] = mapped_column(String, nullable=True)
+    processed_text: Mapped[String] = mapped_column(String, nullable=True, deferred=True)
     status: Mapped[String] = mapped_column(String(50), nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), index=True, nullable=True)
+    pages_total: Mapped[int] = mapped_column(Integer, nullable=True)
+    pages_done: Mapped[int] = mapped_column(Integer, nullable=True)
+    # Maintained by the documents_search_vector_update trigger.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+        nullable=True,
+        deferred=True,
+    )
 
     user: Mapped["UserModel"] = relationship(
         "UserModel",
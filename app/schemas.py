@@ -1,7 +1,8 @@
-from datetime import date
+from datetime import date, datetime
+from enum import StrEnum
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, model_validator
 
 
 class UserBaseSchema(BaseModel):
@@ -38,6 +39,18 @@ class UserInDBSchema(UserBaseSchema):
     id: UUID
     hashed_password: str
 
+    class Config:
+        from_attributes = True
+
+
+class CurrentUserSchema(BaseModel):
+    id: UUID
+    email: EmailStr
+    first_name: str
+    last_name: str
+    gender: str
+    birthday: date
+
 
 class DocumentCreateSchema(BaseModel):
     user_id: UUID
@@ -45,10 +58,75 @@ class DocumentCreateSchema(BaseModel):
 
 class DocumentResponseSchema(BaseModel):
     id: UUID
-    statis: str
+    user_id: UUID
+    status: str
+    pages_total: int | None = None
+    pages_done: int | None = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class DocumentPageSchema(BaseModel):
+    number: int
+    text: str
+    source: str
+
+
+class DocumentPagesSchema(BaseModel):
+    status: str
+    pages_total: int | None = None
+    pages_done: int | None = None
+    pages: list[DocumentPageSchema]
+
+
+class DocumentListSchema(BaseModel):
+    items: list[DocumentResponseSchema]
+    next_cursor: str | None = None
+
+
+class PresignedUploadSchema(BaseModel):
+    doc_id: UUID
+    upload_url: str
+    expires_in: int
+
+
+class BatchUploadResultSchema(BaseModel):
+    filename: str | None
+    doc_id: UUID | None = None
+    error: str | None = None
+
+
+class DocumentSearchHitSchema(BaseModel):
+    doc_id: UUID
+    score: float
+    highlights: list[str] = []
+
+
+class DocumentSearchResultSchema(BaseModel):
+    total: int
+    page: int
+    size: int
+    items: list[DocumentSearchHitSchema]
+
+
+class TaskPriority(StrEnum):
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
 
 
 class OCRTaskSchema(BaseModel):
     doc_id: UUID
     user_id: UUID
     file_path: str
+    priority: TaskPriority = TaskPriority.BULK
+    idempotency_key: str | None = None
+    attempt: int = 0
+    crashes: int = 0
+
+    @model_validator(mode="after")
+    def set_idempotency_key(self):
+        if self.idempotency_key is None:
+            self.idempotency_key = str(self.doc_id)
+        return self
@@ -0,0 +1,58 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+from uuid import UUID
+
+
+@dataclass
+class OCRResult:
+    text: str
+    # The document whose page checkpoints hold this result.
+    user_id: UUID
+    doc_id: UUID
+    pages_total: int | None
+
+
+class OCRResultCache:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._inflight: dict[str, asyncio.Future[OCRResult]] = {}
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+        }
+
+    async def get_or_compute(
+        self,
+        content_hash: str,
+        lookup: Callable[[], Awaitable[OCRResult | None]],
+        compute: Callable[[], Awaitable[OCRResult]],
+    ) -> OCRResult:
+        future = self._inflight.get(content_hash)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[content_hash] = future
+        try:
+            result = await lookup()
+            if result is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                result = await compute()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._inflight[content_hash]
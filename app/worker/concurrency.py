@@ -0,0 +1,89 @@
+import asyncio
+import itertools
+import os
+from collections import Counter
+from typing import Hashable
+
+
+def get_cpu_load() -> float:
+    return os.getloadavg()[0] / (os.cpu_count() or 1)
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that can be changed at runtime and is shared fairly.
+
+    Free slots go to the waiting key with the fewest running tasks. A key may
+    run more than ``fair_share`` tasks while nobody else is waiting; once the
+    limiter is saturated and a key below its share is waiting, ``acquire``
+    returns False for the over-share key so the caller can give way.
+    """
+
+    def __init__(self, limit: int, min_limit: int, max_limit: int, fair_share: int):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.fair_share = fair_share
+        self._limit = self._clamp(limit)
+        self._active = 0
+        self._running: Counter = Counter()
+        self._waiters: dict[int, Hashable] = {}
+        self._tickets = itertools.count()
+        self._condition = asyncio.Condition()
+
+    def _clamp(self, value: int) -> int:
+        return max(self.min_limit, min(self.max_limit, value))
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    async def set_limit(self, value: int):
+        async with self._condition:
+            self._limit = self._clamp(value)
+            self._condition.notify_all()
+
+    def _is_next(self, ticket: int) -> bool:
+        if self._active >= self._limit:
+            return False
+        next_ticket = min(
+            self._waiters, key=lambda t: (self._running[self._waiters[t]], t)
+        )
+        return next_ticket == ticket
+
+    def _should_yield(self, key: Hashable) -> bool:
+        if self._active < self._limit or self._running[key] < self.fair_share:
+            return False
+        return any(
+            other != key and self._running[other] < self.fair_share
+            for other in self._waiters.values()
+        )
+
+    async def acquire(self, key: Hashable) -> bool:
+        async with self._condition:
+            ticket = next(self._tickets)
+            self._waiters[ticket] = key
+            # a new key may be below its share: let over-share waiters give way
+            self._condition.notify_all()
+            try:
+                await self._condition.wait_for(
+                    lambda: self._is_next(ticket) or self._should_yield(key)
+                )
+                if not self._is_next(ticket):
+                    return False
+                self._active += 1
+                self._running[key] += 1
+                return True
+            finally:
+                del self._waiters[ticket]
+                self._condition.notify_all()
+
+    async def release(self, key: Hashable):
+        async with self._condition:
+            self._active -= 1
+            self._running[key] -= 1
+            if not self._running[key]:
+                del self._running[key]
+            self._condition.notify_all()
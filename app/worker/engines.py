@@ -0,0 +1,61 @@
+import logging
+from typing import Protocol
+
+import pytesseract
+from PIL import Image
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+logger = logging.getLogger(__name__)
+
+
+class OCREngine(Protocol):
+    def recognize(self, image: Image.Image | str) -> str: ...
+
+
+class PytesseractEngine:
+    def __init__(self, lang: str):
+        self.lang = lang
+
+    def recognize(self, image: Image.Image | str) -> str:
+        return pytesseract.image_to_string(image, lang=self.lang)
+
+
+class TesserocrEngine:
+    def __init__(self, lang: str, tessdata_path: str | None = None):
+        kwargs = {"lang": lang}
+        if tessdata_path:
+            kwargs["path"] = tessdata_path
+        self.api = tesserocr.PyTessBaseAPI(**kwargs)
+
+    def recognize(self, image: Image.Image | str) -> str:
+        if isinstance(image, str):
+            self.api.SetImageFile(image)
+        else:
+            self.api.SetImage(image)
+        return self.api.GetUTF8Text()
+
+
+def create_engine(name: str, lang: str, tessdata_path: str | None = None) -> OCREngine:
+    if name == "tesserocr":
+        if tesserocr is not None:
+            return TesserocrEngine(lang, tessdata_path)
+        logger.warning("tesserocr is not installed, falling back to pytesseract")
+    return PytesseractEngine(lang)
+
+
+_engine: OCREngine | None = None
+
+
+def init_engine(name: str, lang: str, tessdata_path: str | None = None):
+    global _engine
+    _engine = create_engine(name, lang, tessdata_path)
+
+
+def get_engine() -> OCREngine:
+    if _engine is None:
+        init_engine("pytesseract", "eng")
+    return _engine
@@ -0,0 +1,118 @@
+import asyncio
+import contextlib
+import logging
+from uuid import UUID
+
+from elasticsearch import AsyncElasticsearch
+from elasticsearch.helpers import async_bulk
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAPPINGS = {
+    "properties": {
+        "user_id": {"type": "keyword"},
+        "original_path": {"type": "keyword"},
+        "text": {"type": "text"},
+    }
+}
+
+
+class DocumentIndexer:
+    def __init__(
+        self,
+        client: AsyncElasticsearch,
+        index: str,
+        batch_size: int,
+        flush_interval: float,
+        max_buffer: int,
+        max_retry_delay: float = 60.0,
+    ):
+        self.client = client
+        self.index = index
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max(max_buffer, batch_size)
+        self.max_retry_delay = max_retry_delay
+        self._buffer: list[dict] = []
+        self._failures = 0
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def _create_index(self):
+        try:
+            if not await self.client.indices.exists(index=self.index):
+                await self.client.indices.create(
+                    index=self.index, mappings=INDEX_MAPPINGS
+                )
+        except Exception:
+            logger.exception("Failed to create search index %s", self.index)
+
+    async def start(self):
+        await self._create_index()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    def add(self, doc_id: UUID, user_id: UUID, original_path: str, text: str):
+        self._buffer.append(
+            {
+                "_index": self.index,
+                "_id": str(doc_id),
+                "_source": {
+                    "user_id": str(user_id),
+                    "original_path": original_path,
+                    "text": text,
+                },
+            }
+        )
+        if len(self._buffer) >= self.batch_size:
+            self._full.set()
+
+    async def flush(self):
+        if not self._buffer:
+            return
+        actions, self._buffer = self._buffer, []
+        try:
+            _, errors = await async_bulk(self.client, actions, raise_on_error=False)
+        except asyncio.CancelledError:
+            self._requeue(actions)
+            raise
+        except Exception:
+            logger.exception("Failed to index %s documents", len(actions))
+            self._requeue(actions)
+            self._failures += 1
+            return
+        self._failures = 0
+        if errors:
+            logger.error("Failed to index %s documents: %s", len(errors), errors)
+
+    def _requeue(self, actions: list[dict]):
+        # keep the newest actions: a later update of a document supersedes
+        # the one that failed
+        buffer = actions + self._buffer
+        dropped = len(buffer) - self.max_buffer
+        if dropped > 0:
+            logger.error("Index buffer full, dropping %s documents", dropped)
+            buffer = buffer[dropped:]
+        self._buffer = buffer
+
+    async def _run(self):
+        while True:
+            if self._failures:
+                delay = self.flush_interval * 2 ** (self._failures - 1)
+                await asyncio.sleep(min(delay, self.max_retry_delay))
+                self._full.clear()
+                await self.flush()
+                continue
+            try:
+                await asyncio.wait_for(self._full.wait(), self.flush_interval)
+            except TimeoutError:
+                pass
+            self._full.clear()
+            await self.flush()
@@ -0,0 +1,260 @@
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from faststream import FastStream
+from faststream.rabbit import Channel, RabbitQueue
+from faststream.rabbit.annotations import RabbitMessage
+
+from app.api.clients import broker, es_client, queue_monitor
+from app.api.managers import (
+    DEAD_LETTER_QUEUE,
+    OCR_QUEUES,
+    OCRManager,
+    TaskPublisher,
+)
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.crud import documents_crud
+from app.models import DocumentStatus
+from app.schemas import OCRTaskSchema, TaskPriority
+from app.worker.cache import OCRResultCache
+from app.worker.concurrency import AdaptiveLimiter, get_cpu_load
+from app.worker.engines import init_engine
+from app.worker.indexer import DocumentIndexer
+
+logger = logging.getLogger(__name__)
+
+
+class OCRWorker:
+    def __init__(self):
+        self.executors: dict[TaskPriority, ProcessPoolExecutor] = {}
+        self.limiters = {
+            TaskPriority.INTERACTIVE: AdaptiveLimiter(
+                settings.OCR_INTERACTIVE_CONCURRENCY,
+                settings.OCR_INTERACTIVE_CONCURRENCY,
+                settings.OCR_INTERACTIVE_CONCURRENCY,
+                settings.OCR_USER_MAX_INFLIGHT,
+            ),
+            TaskPriority.BULK: AdaptiveLimiter(
+                settings.OCR_WORKER_CONCURRENCY,
+                settings.OCR_WORKER_MIN_CONCURRENCY,
+                settings.OCR_WORKER_MAX_CONCURRENCY,
+                settings.OCR_USER_MAX_INFLIGHT,
+            ),
+        }
+        self._adapt_task: asyncio.Task | None = None
+        self.cache = OCRResultCache()
+        self._inflight: set[str] = set()
+        self.indexer: DocumentIndexer | None = None
+        if settings.SEARCH_BACKEND == "elasticsearch":
+            self.indexer = DocumentIndexer(
+                es_client,
+                settings.ES_INDEX,
+                settings.ES_BULK_SIZE,
+                settings.ES_FLUSH_INTERVAL,
+                settings.ES_MAX_BUFFER,
+            )
+
+    @staticmethod
+    def _create_executor(max_workers: int | None) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=init_engine,
+            initargs=(
+                settings.OCR_ENGINE,
+                settings.OCR_LANG,
+                settings.OCR_TESSDATA_PATH,
+            ),
+        )
+
+    async def start(self):
+        self.executors = {
+            TaskPriority.INTERACTIVE: self._create_executor(
+                settings.OCR_INTERACTIVE_PROCESSES
+            ),
+            TaskPriority.BULK: self._create_executor(settings.OCR_WORKER_PROCESSES),
+        }
+        if self.indexer is not None:
+            await self.indexer.start()
+
+    async def declare_queues(self):
+        await broker.declare_queue(RabbitQueue(DEAD_LETTER_QUEUE, durable=True))
+
+    async def start_autoscaler(self):
+        self._adapt_task = asyncio.create_task(self._adapt_concurrency())
+
+    async def _adapt_concurrency(self):
+        limiter = self.limiters[TaskPriority.BULK]
+        while True:
+            await asyncio.sleep(settings.OCR_ADAPT_INTERVAL)
+            try:
+                depth = await queue_monitor.get_depth(OCR_QUEUES[TaskPriority.BULK])
+            except Exception:
+                logger.warning("Could not read OCR queue depth", exc_info=True)
+                continue
+            load = get_cpu_load()
+            limit = limiter.limit
+            if load > settings.OCR_CPU_HIGH:
+                limit -= 1
+            elif depth > limiter.active and load < settings.OCR_CPU_LOW:
+                limit += 1
+            elif not depth and limit > settings.OCR_WORKER_CONCURRENCY:
+                limit -= 1
+            if limit != limiter.limit:
+                await limiter.set_limit(limit)
+                logger.info(
+                    "OCR concurrency set to %s (cpu load %.2f, queue depth %s)",
+                    limiter.limit,
+                    load,
+                    depth,
+                )
+
+    async def stop(self):
+        if self._adapt_task is not None:
+            self._adapt_task.cancel()
+        if self.indexer is not None:
+            await self.indexer.stop()
+        await es_client.close()
+        for executor in self.executors.values():
+            await asyncio.to_thread(executor.shutdown, cancel_futures=True)
+        self.executors = {}
+
+    async def _replace_executor(
+        self, priority: TaskPriority, broken: ProcessPoolExecutor
+    ):
+        # Every task that shared the pool sees it break; replace it only once.
+        if self.executors.get(priority) is not broken:
+            return
+        max_workers = (
+            settings.OCR_INTERACTIVE_PROCESSES
+            if priority == TaskPriority.INTERACTIVE
+            else settings.OCR_WORKER_PROCESSES
+        )
+        self.executors[priority] = self._create_executor(max_workers)
+        await asyncio.to_thread(broken.shutdown, wait=False, cancel_futures=True)
+
+    async def _process(self, task: OCRTaskSchema) -> str | None:
+        executor = self.executors[task.priority]
+        async with async_session_maker() as session:
+            manager = OCRManager(session, executor, self.cache, self.indexer)
+            try:
+                await manager.process_ocr(task)
+            except BrokenProcessPool:
+                # A pool child died (OOM kill, crash in poppler/tesseract).
+                # It may not be this task's fault, so count it as a crash
+                # rather than using up an attempt.
+                logger.exception(
+                    "OCR process pool broke while running task %s",
+                    task.idempotency_key,
+                )
+                await self._replace_executor(task.priority, executor)
+                await self._record_crash(task, "OCR process pool broke")
+                return None
+            except Exception as e:
+                logger.exception(
+                    "OCR task %s failed on attempt %s",
+                    task.idempotency_key,
+                    task.attempt + 1,
+                )
+                await manager.mark_failed(task, self._can_retry(task))
+                return str(e)
+        logger.info("OCR result cache: %s", self.cache.stats())
+        return None
+
+    @staticmethod
+    def _can_retry(task: OCRTaskSchema) -> bool:
+        return task.attempt + 1 < settings.OCR_MAX_ATTEMPTS
+
+    async def _retry_or_dead_letter(self, task: OCRTaskSchema, error: str):
+        publisher = TaskPublisher(broker)
+        if self._can_retry(task):
+            await publisher.publish_delayed(
+                task.model_copy(update={"attempt": task.attempt + 1}),
+                settings.OCR_RETRY_DELAY * 2**task.attempt,
+            )
+        else:
+            await publisher.publish_dead(task, error)
+
+    @staticmethod
+    async def _was_started(task: OCRTaskSchema) -> bool:
+        # Prefetched tasks are redelivered on every restart too; only those
+        # that got as far as PROCESSING count as crashes.
+        async with async_session_maker() as session:
+            progress = await documents_crud.get_document_progress(session, task.doc_id)
+        return progress is not None and progress.status == DocumentStatus.PROCESSING
+
+    async def _record_crash(self, task: OCRTaskSchema, error: str):
+        # Crashes resume from the page checkpoints, so a page that kills the
+        # process would otherwise be retried forever.
+        retry = task.crashes + 1 < settings.OCR_MAX_CRASHES
+        async with async_session_maker() as session:
+            manager = OCRManager(session, None, self.cache, self.indexer)
+            await manager.mark_failed(task, retry)
+        publisher = TaskPublisher(broker)
+        if retry:
+            await publisher.publish(
+                task.model_copy(update={"crashes": task.crashes + 1})
+            )
+        else:
+            await publisher.publish_dead(task, error)
+
+    async def _defer(self, task: OCRTaskSchema):
+        # The lane is full, the user already holds their share of it and
+        # another user is waiting: free the prefetch slot by moving the task
+        # to the back of the bulk lane.
+        await TaskPublisher(broker).publish(
+            task.model_copy(update={"priority": TaskPriority.BULK})
+        )
+
+    async def handle(self, task: OCRTaskSchema, redelivered: bool = False):
+        if task.idempotency_key in self._inflight:
+            logger.info("Skipping duplicate OCR task %s", task.idempotency_key)
+            return
+        if redelivered and await self._was_started(task):
+            # The consumer went away without acking a task it had started,
+            # most likely because the worker died while processing it.
+            logger.warning("OCR task %s was redelivered", task.idempotency_key)
+            await self._record_crash(task, "Worker stopped while processing")
+            return
+
+        limiter = self.limiters[task.priority]
+        self._inflight.add(task.idempotency_key)
+        try:
+            if not await limiter.acquire(task.user_id):
+                await self._defer(task)
+                return
+            try:
+                error = await self._process(task)
+            finally:
+                await limiter.release(task.user_id)
+            if error is not None:
+                await self._retry_or_dead_letter(task, error)
+        finally:
+            self._inflight.discard(task.idempotency_key)
+
+
+worker = OCRWorker()
+
+app = FastStream(broker)
+app.on_startup(worker.start)
+app.after_startup(worker.declare_queues)
+app.after_startup(worker.start_autoscaler)
+app.after_shutdown(worker.stop)
+
+
+@broker.subscriber(
+    queue=OCR_QUEUES[TaskPriority.INTERACTIVE],
+    channel=Channel(prefetch_count=settings.OCR_INTERACTIVE_PREFETCH),
+)
+async def process_interactive_ocr_task(task: OCRTaskSchema, message: RabbitMessage):
+    await worker.handle(task, message.raw_message.redelivered)
+
+
+@broker.subscriber(
+    queue=OCR_QUEUES[TaskPriority.BULK],
+    channel=Channel(prefetch_count=settings.OCR_WORKER_PREFETCH),
+)
+async def process_ocr_task(task: OCRTaskSchema, message: RabbitMessage):
+    await worker.handle(task, message.raw_message.redelivered)
@@ -0,0 +1,182 @@
+import os
+import subprocess
+import tempfile
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+from pdf2image import convert_from_path, pdfinfo_from_path
+from PIL import Image
+
+from app.worker.engines import OCREngine, get_engine
+from app.worker.preprocessing import PreprocessOptions, preprocess
+from app.worker.tiling import ImageTile, TilingOptions, find_cuts
+
+
+@dataclass
+class PageText:
+    number: int
+    text: str
+    source: str
+
+
+@dataclass
+class OCROptions:
+    pdf_dpi: int = 200
+    render_dir: str | None = None
+    min_text_chars: int = 32
+    preprocess: PreprocessOptions = field(default_factory=PreprocessOptions)
+    tiling: TilingOptions = field(default_factory=TilingOptions)
+
+
+def count_pdf_pages(path: str) -> int:
+    return int(pdfinfo_from_path(path)["Pages"])
+
+
+def extract_pdf_text(path: str, first_page: int, last_page: int) -> list[str]:
+    pages_count = last_page - first_page + 1
+    try:
+        result = subprocess.run(
+            [
+                "pdftotext",
+                "-layout",
+                "-enc",
+                "UTF-8",
+                "-f",
+                str(first_page),
+                "-l",
+                str(last_page),
+                path,
+                "-",
+            ],
+            capture_output=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError:
+        return [""] * pages_count
+    pages = result.stdout.decode(errors="replace").split("\f")
+    pages += [""] * (pages_count - len(pages))
+    return pages[:pages_count]
+
+
+def page_runs(
+    numbers: list[int], max_length: int | None = None
+) -> list[tuple[int, int]]:
+    runs = []
+    for number in numbers:
+        if (
+            runs
+            and runs[-1][1] == number - 1
+            and (max_length is None or number - runs[-1][0] < max_length)
+        ):
+            runs[-1] = (runs[-1][0], number)
+        else:
+            runs.append((number, number))
+    return runs
+
+
+def recognize_page_file(engine: OCREngine, path: str, options: OCROptions) -> str:
+    if not options.preprocess.enabled:
+        return engine.recognize(path)
+    with Image.open(path) as image:
+        prepared = preprocess(image, options.pdf_dpi, options.preprocess)
+    # Hand the engine a file next to the rendered page rather than a PIL
+    # image, which both engines would serialize again. Grayscale renders are
+    # already .pgm, so the prepared page needs a name of its own.
+    prepared_path = f"{os.path.splitext(path)[0]}.prep.pgm"
+    prepared.save(prepared_path)
+    try:
+        return engine.recognize(prepared_path)
+    finally:
+        os.unlink(prepared_path)
+
+
+def ocr_pdf_pages(
+    path: str, first_page: int, last_page: int, options: OCROptions
+) -> list[str]:
+    engine = get_engine()
+    with tempfile.TemporaryDirectory(dir=options.render_dir) as render_dir:
+        page_paths = convert_from_path(
+            path,
+            dpi=options.pdf_dpi,
+            first_page=first_page,
+            last_page=last_page,
+            output_folder=render_dir,
+            paths_only=True,
+            fmt="ppm",
+            grayscale=True,
+        )
+        texts = []
+        for page_path in page_paths:
+            texts.append(recognize_page_file(engine, page_path, options))
+            os.unlink(page_path)
+        return texts
+
+
+def recognize_pdf_pages(
+    path: str, first_page: int, last_page: int, options: OCROptions
+) -> list[PageText]:
+    numbers = range(first_page, last_page + 1)
+    texts = extract_pdf_text(path, first_page, last_page)
+    pages = {
+        number: PageText(number, text, "text")
+        for number, text in zip(numbers, texts)
+        if len(text.strip()) >= options.min_text_chars
+    }
+
+    missing = [number for number in numbers if number not in pages]
+    for first, last in page_runs(missing):
+        for number, text in zip(
+            range(first, last + 1), ocr_pdf_pages(path, first, last, options)
+        ):
+            pages[number] = PageText(number, text, "ocr")
+
+    return [pages[number] for number in numbers]
+
+
+def get_image_dpi(image: Image.Image) -> float | None:
+    dpi = image.info.get("dpi")
+    return float(max(dpi)) if dpi else None
+
+
+def recognize_image(path: str, options: OCROptions) -> str:
+    try:
+        with Image.open(path) as image:
+            prepared = preprocess(image, get_image_dpi(image), options.preprocess)
+            return get_engine().recognize(prepared)
+    except Exception as img_e:
+        raise ValueError(f"Failed to process image: {str(img_e)}")
+
+
+def plan_image_tiles(
+    path: str, output_dir: str, options: OCROptions
+) -> list[ImageTile] | None:
+    with Image.open(path) as image:
+        if image.height < options.tiling.min_height:
+            return None
+        # Tall images are split into strips, so the pixel budget meant for a
+        # single page would only shrink their text.
+        prepared = preprocess(
+            image,
+            get_image_dpi(image),
+            replace(options.preprocess, max_pixels=None),
+        )
+
+    # Once preprocessed, the image is written out even when it needs no
+    # cutting, so a single tile is OCR'd as is instead of being prepared twice.
+    gray = np.asarray(prepared.convert("L"))
+    if gray.shape[0] < options.tiling.min_height:
+        cuts = [(0, gray.shape[0], False)]
+    else:
+        cuts = find_cuts(gray, options.tiling)
+
+    os.makedirs(output_dir, exist_ok=True)
+    tiles = []
+    for number, (top, bottom, overlaps_previous) in enumerate(cuts):
+        tile_path = os.path.join(output_dir, f"{number:04d}.pgm")
+        Image.fromarray(gray[top:bottom]).save(tile_path)
+        tiles.append(ImageTile(tile_path, top, bottom, overlaps_previous))
+    return tiles
+
+
+def recognize_tile(path: str) -> str:
+    return get_engine().recognize(path)
@@ -0,0 +1,109 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image
+
+GRAYSCALE_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+# Cameras and screenshots that do record a DPI almost always write 72.
+NOMINAL_DPI = 72
+
+
+@dataclass
+class PreprocessOptions:
+    enabled: bool = True
+    target_dpi: int = 300
+    max_width: int = 4000
+    max_pixels: int | None = 8_000_000
+    binarize: bool = True
+    deskew: bool = True
+    max_skew_angle: float = 5.0
+    skew_angle_step: float = 0.5
+
+
+def to_grayscale(image: Image.Image) -> np.ndarray:
+    if image.mode == "L":
+        return np.asarray(image)
+    pixels = np.asarray(image.convert("RGB"), dtype=np.float32)
+    return (pixels @ GRAYSCALE_WEIGHTS).astype(np.uint8)
+
+
+def get_scale(
+    size: tuple[int, int], source_dpi: float | None, options: PreprocessOptions
+) -> float:
+    scale = 1.0
+    if source_dpi and source_dpi > options.target_dpi:
+        scale = options.target_dpi / source_dpi
+    width = size[0] * scale
+    if width > options.max_width:
+        scale *= options.max_width / width
+    # Photos usually carry no DPI (or a nominal 72), so the DPI rule above
+    # never fires for them; bound their size by pixel count instead. A real
+    # DPI, such as a PDF render's, means the page is already at scan size.
+    if options.max_pixels and (not source_dpi or source_dpi <= NOMINAL_DPI):
+        pixels = size[0] * size[1] * scale**2
+        if pixels > options.max_pixels:
+            scale *= math.sqrt(options.max_pixels / pixels)
+    return scale
+
+
+def otsu_threshold(gray: np.ndarray) -> int:
+    histogram = np.bincount(gray.ravel(), minlength=256).astype(np.float64)
+    weights = histogram.cumsum()
+    means = (histogram * np.arange(256)).cumsum()
+    total_weight, total_mean = weights[-1], means[-1]
+    background = weights[:-1]
+    foreground = total_weight - background
+    valid = (background > 0) & (foreground > 0)
+    variance = np.zeros_like(background)
+    variance[valid] = (
+        total_mean * background[valid] / total_weight - means[:-1][valid]
+    ) ** 2 / (background[valid] * foreground[valid])
+    return int(variance.argmax())
+
+
+def binarize(gray: np.ndarray) -> np.ndarray:
+    return np.where(gray > otsu_threshold(gray), 255, 0).astype(np.uint8)
+
+
+def estimate_skew(binary: np.ndarray, options: PreprocessOptions) -> float:
+    sample = Image.fromarray(binary)
+    sample.thumbnail((1000, 1000))
+    ink = Image.fromarray(255 - np.asarray(sample))
+
+    best_angle, best_score = 0.0, -1.0
+    angles = np.arange(
+        -options.max_skew_angle,
+        options.max_skew_angle + options.skew_angle_step,
+        options.skew_angle_step,
+    )
+    for angle in angles:
+        rotated = np.asarray(ink.rotate(float(angle), resample=Image.NEAREST))
+        profile = rotated.sum(axis=1, dtype=np.float64)
+        score = float(np.square(np.diff(profile)).sum())
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+def preprocess(
+    image: Image.Image, source_dpi: float | None, options: PreprocessOptions
+) -> Image.Image:
+    if not options.enabled:
+        return image
+
+    gray = to_grayscale(image)
+    scale = get_scale(image.size, source_dpi, options)
+    if scale < 1.0:
+        size = (round(gray.shape[1] * scale), round(gray.shape[0] * scale))
+        gray = np.asarray(Image.fromarray(gray).resize(size, Image.LANCZOS))
+
+    pixels = binarize(gray) if options.binarize else gray
+    result = Image.fromarray(pixels)
+    if options.deskew:
+        angle = estimate_skew(pixels if options.binarize else binarize(gray), options)
+        if angle:
+            result = result.rotate(
+                angle, resample=Image.BICUBIC, expand=True, fillcolor=255
+            )
+    return result
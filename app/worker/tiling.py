@@ -0,0 +1,71 @@
+import difflib
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class TilingOptions:
+    min_height: int = 6000
+    tile_height: int = 2000
+    overlap: int = 80
+    max_seam_lines: int = 5
+
+
+@dataclass
+class ImageTile:
+    path: str
+    top: int
+    bottom: int
+    overlaps_previous: bool
+
+
+def find_cuts(gray: np.ndarray, options: TilingOptions) -> list[tuple[int, int, bool]]:
+    height = gray.shape[0]
+    blank_rows = np.flatnonzero((gray < 128).sum(axis=1) == 0)
+    search = options.tile_height // 4
+
+    strips = []
+    top, overlaps_previous = 0, False
+    while height - top > options.tile_height + search:
+        target = top + options.tile_height
+        candidates = blank_rows[
+            (blank_rows >= target - search) & (blank_rows <= target + search)
+        ]
+        if candidates.size:
+            cut = int(candidates[np.abs(candidates - target).argmin()])
+            strips.append((top, cut, overlaps_previous))
+            top, overlaps_previous = cut, False
+        else:
+            strips.append((top, target + options.overlap, overlaps_previous))
+            top, overlaps_previous = target - options.overlap, True
+    strips.append((top, height, overlaps_previous))
+    return strips
+
+
+def _normalize(line: str) -> str:
+    return " ".join(line.split())
+
+
+def _same_line(first: str, second: str) -> bool:
+    return difflib.SequenceMatcher(None, first, second).ratio() >= 0.8
+
+
+def _merge_seam(previous: list[str], current: list[str], max_lines: int) -> list[str]:
+    for count in range(min(max_lines, len(previous), len(current)), 0, -1):
+        if all(
+            _same_line(_normalize(a), _normalize(b))
+            for a, b in zip(previous[-count:], current[:count])
+        ):
+            return current[count:]
+    return current
+
+
+def stitch_tiles(tiles: list[ImageTile], texts: list[str], max_lines: int) -> str:
+    lines: list[str] = []
+    for tile, text in zip(tiles, texts):
+        current = [line for line in text.splitlines() if line.strip()]
+        if tile.overlaps_previous:
+            current = _merge_seam(lines, current, max_lines)
+        lines.extend(current)
+    return "\n".join(lines)
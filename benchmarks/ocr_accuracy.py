@@ -0,0 +1,58 @@
+"""Compare OCR time and accuracy with and without preprocessing.
+
+Every sample image needs a ground truth file next to it with the same name
+and a .txt extension.
+
+Usage: python -m benchmarks.ocr_accuracy samples/*.png [--engine pytesseract]
+"""
+
+import argparse
+import difflib
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from app.worker.engines import create_engine
+from app.worker.ocr import get_image_dpi
+from app.worker.preprocessing import PreprocessOptions, preprocess
+
+
+def similarity(expected: str, actual: str) -> float:
+    return difflib.SequenceMatcher(
+        None, " ".join(expected.split()), " ".join(actual.split())
+    ).ratio()
+
+
+def evaluate(engine, samples: list[Path], options: PreprocessOptions):
+    elapsed, scores = 0.0, []
+    for sample in samples:
+        expected = sample.with_suffix(".txt").read_text()
+        with Image.open(sample) as image:
+            started = time.perf_counter()
+            text = engine.recognize(preprocess(image, get_image_dpi(image), options))
+            elapsed += time.perf_counter() - started
+        scores.append(similarity(expected, text))
+    return elapsed / len(samples), sum(scores) / len(scores)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("samples", nargs="+", type=Path)
+    parser.add_argument("--engine", default="pytesseract")
+    parser.add_argument("--lang", default="rus+eng")
+    parser.add_argument("--target-dpi", type=int, default=300)
+    args = parser.parse_args()
+
+    engine = create_engine(args.engine, args.lang)
+    variants = {
+        "raw": PreprocessOptions(enabled=False),
+        "preprocessed": PreprocessOptions(target_dpi=args.target_dpi),
+    }
+    for name, options in variants.items():
+        seconds, score = evaluate(engine, args.samples, options)
+        print(f"{name}: {seconds:.3f} s/page, similarity {score:.3f}")
+
+
+if __name__ == "__main__":
+    main()
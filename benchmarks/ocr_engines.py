@@ -0,0 +1,46 @@
+"""Compare OCR engine throughput in pages per second.
+
+Usage: python -m benchmarks.ocr_engines page1.png page2.png ... [--repeat 3]
+"""
+
+import argparse
+import time
+
+from PIL import Image
+
+from app.worker.engines import PytesseractEngine, TesserocrEngine, tesserocr
+
+
+def run(engine, images: list[Image.Image], repeat: int) -> float:
+    engine.recognize(images[0])
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for image in images:
+            engine.recognize(image)
+    return len(images) * repeat / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("images", nargs="+")
+    parser.add_argument("--lang", default="rus+eng")
+    parser.add_argument("--tessdata-path", default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    images = [Image.open(path) for path in args.images]
+    for image in images:
+        image.load()
+
+    engines = {"pytesseract": PytesseractEngine(args.lang)}
+    if tesserocr is not None:
+        engines["tesserocr"] = TesserocrEngine(args.lang, args.tessdata_path)
+    else:
+        print("tesserocr is not installed, skipping")
+
+    for name, engine in engines.items():
+        print(f"{name}: {run(engine, images, args.repeat):.2f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import asyncio
+
+from app.worker.concurrency import AdaptiveLimiter
+
+
+async def _over_share_waiter_yields_to_new_key():
+    limiter = AdaptiveLimiter(limit=1, min_limit=1, max_limit=1, fair_share=1)
+    assert await limiter.acquire("a")
+
+    waiter = asyncio.create_task(limiter.acquire("a"))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    other = asyncio.create_task(limiter.acquire("b"))
+    # "b" arrives after a's waiter is parked; it must give way without
+    # waiting for the next release
+    assert await asyncio.wait_for(waiter, 1) is False
+    assert not other.done()
+
+    await limiter.release("a")
+    assert await asyncio.wait_for(other, 1) is True
+    await limiter.release("b")
+    assert limiter.active == 0
+
+
+def test_over_share_waiter_yields_to_new_key():
+    asyncio.run(_over_share_waiter_yields_to_new_key())
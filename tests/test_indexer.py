@@ -0,0 +1,63 @@
+import asyncio
+import uuid
+
+from app.worker import indexer as indexer_module
+from app.worker.indexer import DocumentIndexer
+
+
+def make_indexer(max_buffer=10):
+    return DocumentIndexer(
+        None, "documents", batch_size=2, flush_interval=0.01, max_buffer=max_buffer
+    )
+
+
+def add(indexer, count):
+    for number in range(count):
+        indexer.add(uuid.uuid4(), uuid.uuid4(), f"doc-{number}", "text")
+
+
+def test_failed_batch_is_requeued(monkeypatch):
+    calls = []
+
+    async def failing_bulk(client, actions, **kwargs):
+        calls.append(len(actions))
+        raise ConnectionError("es down")
+
+    monkeypatch.setattr(indexer_module, "async_bulk", failing_bulk)
+    indexer = make_indexer(max_buffer=3)
+    add(indexer, 2)
+
+    asyncio.run(indexer.flush())
+    add(indexer, 2)
+    asyncio.run(indexer.flush())
+
+    assert calls == [2, 4]
+    # bounded: the oldest action is dropped
+    assert [a["_source"]["original_path"] for a in indexer._buffer] == [
+        "doc-1",
+        "doc-0",
+        "doc-1",
+    ]
+
+
+def test_stop_waits_for_running_flush(monkeypatch):
+    indexed = []
+
+    async def slow_bulk(client, actions, **kwargs):
+        await asyncio.sleep(0.05)
+        indexed.extend(actions)
+        return len(actions), []
+
+    async def scenario():
+        indexer = make_indexer()
+        indexer._task = asyncio.create_task(indexer._run())
+        add(indexer, 2)
+        await asyncio.sleep(0.02)
+        await indexer.stop()
+        return indexer
+
+    monkeypatch.setattr(indexer_module, "async_bulk", slow_bulk)
+    indexer = asyncio.run(scenario())
+
+    assert len(indexed) == 2
+    assert indexer._buffer == []
@@ -0,0 +1,83 @@
+import os
+
+from PIL import Image
+
+from app.worker import ocr
+from app.worker.preprocessing import PreprocessOptions
+from app.worker.tiling import TilingOptions
+
+
+class FakeEngine:
+    def __init__(self):
+        self.paths = []
+
+    def recognize(self, image):
+        assert isinstance(image, str)
+        assert os.path.exists(image)
+        self.paths.append(image)
+        return f"page {len(self.paths)}"
+
+
+def fake_convert_from_path(path, first_page, last_page, output_folder, **kwargs):
+    # pdf2image names grayscale ppm renders <stem>-<page>.pgm
+    paths = []
+    for number in range(first_page, last_page + 1):
+        page_path = os.path.join(output_folder, f"abc-{number}.pgm")
+        Image.new("L", (200, 300), 255).save(page_path)
+        paths.append(page_path)
+    return paths
+
+
+def test_ocr_pdf_pages_with_preprocessing(monkeypatch, tmp_path):
+    engine = FakeEngine()
+    monkeypatch.setattr(ocr, "convert_from_path", fake_convert_from_path)
+    monkeypatch.setattr(ocr, "get_engine", lambda: engine)
+    options = ocr.OCROptions(
+        render_dir=str(tmp_path), preprocess=PreprocessOptions(deskew=False)
+    )
+
+    texts = ocr.ocr_pdf_pages("doc.pdf", 1, 3, options)
+
+    assert texts == ["page 1", "page 2", "page 3"]
+    assert all(path.endswith(".prep.pgm") for path in engine.paths)
+    assert os.listdir(tmp_path) == []
+
+
+def test_ocr_pdf_pages_without_preprocessing(monkeypatch, tmp_path):
+    engine = FakeEngine()
+    monkeypatch.setattr(ocr, "convert_from_path", fake_convert_from_path)
+    monkeypatch.setattr(ocr, "get_engine", lambda: engine)
+    options = ocr.OCROptions(
+        render_dir=str(tmp_path), preprocess=PreprocessOptions(enabled=False)
+    )
+
+    assert ocr.ocr_pdf_pages("doc.pdf", 2, 3, options) == ["page 1", "page 2"]
+    assert [os.path.basename(path) for path in engine.paths] == [
+        "abc-2.pgm",
+        "abc-3.pgm",
+    ]
+    assert os.listdir(tmp_path) == []
+
+
+def test_plan_image_tiles_keeps_single_prepared_tile(tmp_path):
+    image_path = str(tmp_path / "scan.png")
+    Image.new("RGB", (200, 1200), "white").save(image_path)
+    options = ocr.OCROptions(
+        preprocess=PreprocessOptions(deskew=False),
+        tiling=TilingOptions(min_height=1000, tile_height=2000),
+    )
+
+    tiles = ocr.plan_image_tiles(image_path, str(tmp_path / "tiles"), options)
+
+    assert len(tiles) == 1
+    assert os.path.exists(tiles[0].path)
+    assert (tiles[0].top, tiles[0].bottom) == (0, Image.open(tiles[0].path).height)
+
+
+def test_plan_image_tiles_skips_short_images(tmp_path):
+    image_path = str(tmp_path / "scan.png")
+    Image.new("RGB", (200, 300), "white").save(image_path)
+    options = ocr.OCROptions(tiling=TilingOptions(min_height=1000))
+
+    assert ocr.plan_image_tiles(image_path, str(tmp_path / "tiles"), options) is None
+    assert not os.path.exists(tmp_path / "tiles")
@@ -0,0 +1,13 @@
+from app.worker.preprocessing import PreprocessOptions, get_scale
+
+OPTIONS = PreprocessOptions(max_width=10_000, max_pixels=8_000_000)
+
+
+def test_pixel_cap_skips_pages_with_real_dpi():
+    assert get_scale((3000, 4000), 200, OPTIONS) == 1.0
+
+
+def test_pixel_cap_applies_to_photos():
+    for dpi in (None, 72):
+        scale = get_scale((3000, 4000), dpi, OPTIONS)
+        assert round(3000 * scale * 4000 * scale) == 8_000_000